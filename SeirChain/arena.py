@@ -0,0 +1,149 @@
+"""
+Compact storage for parsed expressions.
+
+The parser allocates expression nodes into an ExpressionArena: parallel
+arrays holding each node's kind, operands and source span, plus pools for
+literal values and interned names. Downstream passes see ordinary AST
+nodes through lightweight views that subclass the classes in ast.py and
+read their fields from the arena on access. Each node gets at most one view,
+created on first access and reused afterwards, so repeated passes over the
+tree allocate nothing and `node.left is node.left` holds.
+"""
+
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+from ast import *
+
+LITERAL = 0
+IDENTIFIER = 1
+CALL = 2
+BINARY = 3
+UNARY = 4
+
+class ExpressionArena:
+    def __init__(self):
+        self.kinds = array("B")
+        # Operand slots, meaning depends on kind:
+        #   LITERAL    a = constant index
+        #   IDENTIFIER a = name index
+        #   CALL       a = callee node, b = first argument slot, c = argument count
+        #   BINARY     a = left node, b = right node, c = operator index
+        #   UNARY      a = operand node, c = operator index
+        self.a = array("l")
+        self.b = array("l")
+        self.c = array("l")
+        self.starts = array("l")
+        self.ends = array("l")
+        self.arguments = array("l")
+        self.constants: List[Any] = []
+        self.names: List[str] = []
+        self.name_index: Dict[str, int] = {}
+        self.views: List[Optional[Expression]] = []
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def _add(self, kind: int, a: int, b: int, c: int, start: int, end: int) -> int:
+        self.kinds.append(kind)
+        self.a.append(a)
+        self.b.append(b)
+        self.c.append(c)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.views.append(None)
+        return len(self.kinds) - 1
+
+    def intern(self, name: str) -> int:
+        index = self.name_index.get(name)
+        if index is None:
+            index = self.name_index[name] = len(self.names)
+            self.names.append(name)
+        return index
+
+    def literal(self, value: Any, start: int, end: int) -> int:
+        self.constants.append(value)
+        return self._add(LITERAL, len(self.constants) - 1, 0, 0, start, end)
+
+    def identifier(self, name: str, start: int, end: int) -> int:
+        return self._add(IDENTIFIER, self.intern(name), 0, 0, start, end)
+
+    def call(self, callee: int, args: List[int], end: int) -> int:
+        first = len(self.arguments)
+        self.arguments.extend(args)
+        return self._add(CALL, callee, first, len(args), self.starts[callee], end)
+
+    def binary(self, operator: str, left: int, right: int) -> int:
+        return self._add(BINARY, left, right, self.intern(operator), self.starts[left], self.ends[right])
+
+    def unary(self, operator: str, operand: int, start: int) -> int:
+        return self._add(UNARY, operand, 0, self.intern(operator), start, self.ends[operand])
+
+    def view(self, index: int) -> Expression:
+        view = self.views[index]
+        if view is None:
+            view = self.views[index] = VIEW_CLASSES[self.kinds[index]](self, index)
+        return view
+
+class ArenaView:
+    def __init__(self, arena: ExpressionArena, index: int):
+        self.arena = arena
+        self.index = index
+
+    @property
+    def span(self) -> Tuple[int, int]:
+        return self.arena.starts[self.index], self.arena.ends[self.index]
+
+class LiteralView(ArenaView, Literal):
+    @property
+    def value(self):
+        return self.arena.constants[self.arena.a[self.index]]
+
+class IdentifierView(ArenaView, Identifier):
+    @property
+    def name(self) -> str:
+        return self.arena.names[self.arena.a[self.index]]
+
+class CallExpressionView(ArenaView, CallExpression):
+    @property
+    def callee(self) -> Expression:
+        return self.arena.view(self.arena.a[self.index])
+
+    @property
+    def arguments(self) -> List[Expression]:
+        # Cached on the view, so every pass sees the same list
+        arguments = self.__dict__.get("_arguments")
+        if arguments is None:
+            arena = self.arena
+            first = arena.b[self.index]
+            arguments = self._arguments = [arena.view(i) for i in arena.arguments[first:first + arena.c[self.index]]]
+        return arguments
+
+class BinaryExpressionView(ArenaView, BinaryExpression):
+    @property
+    def left(self) -> Expression:
+        return self.arena.view(self.arena.a[self.index])
+
+    @property
+    def right(self) -> Expression:
+        return self.arena.view(self.arena.b[self.index])
+
+    @property
+    def operator(self) -> str:
+        return self.arena.names[self.arena.c[self.index]]
+
+class UnaryExpressionView(ArenaView, UnaryExpression):
+    @property
+    def operand(self) -> Expression:
+        return self.arena.view(self.arena.a[self.index])
+
+    @property
+    def operator(self) -> str:
+        return self.arena.names[self.arena.c[self.index]]
+
+VIEW_CLASSES = {
+    LITERAL: LiteralView,
+    IDENTIFIER: IdentifierView,
+    CALL: CallExpressionView,
+    BINARY: BinaryExpressionView,
+    UNARY: UnaryExpressionView,
+}
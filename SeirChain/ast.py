@@ -1,4 +1,4 @@
-from typing import List, Optional, Union
+from typing import List, Optional, Tuple, Union
 
 class Node:
     pass
@@ -36,6 +36,10 @@ class Block(Node):
     def __init__(self, statements: List[Node]):
         self.statements = statements
 
+class ParallelBlock(Node):
+    def __init__(self, body: Block):
+        self.body = body
+
 class VariableDeclaration(Node):
     def __init__(self, name: str, type_name: Optional[str], mutable: bool, initializer: Optional['Expression']):
         self.name = name
@@ -44,7 +48,8 @@ class VariableDeclaration(Node):
         self.initializer = initializer
 
 class Expression(Node):
-    pass
+    # (start, end) source offsets, when the parser recorded them
+    span: Optional[Tuple[int, int]] = None
 
 class Literal(Expression):
     def __init__(self, value: Union[str, int, bool, None]):
@@ -59,6 +64,17 @@ class CallExpression(Expression):
         self.callee = callee
         self.arguments = arguments
 
+class BinaryExpression(Expression):
+    def __init__(self, left: Expression, operator: str, right: Expression):
+        self.left = left
+        self.operator = operator
+        self.right = right
+
+class UnaryExpression(Expression):
+    def __init__(self, operator: str, operand: Expression):
+        self.operator = operator
+        self.operand = operand
+
 class MatchExpression(Expression):
     def __init__(self, expression: Expression, cases: List['MatchCase']):
         self.expression = expression
@@ -80,4 +96,4 @@ class IdentifierPattern(Pattern):
     def __init__(self, name: str):
         self.name = name
 
-# Additional AST nodes can be added as needed for parallel blocks, fractal_spawn, etc.
+# Additional AST nodes can be added as needed for fractal_spawn, etc.
@@ -0,0 +1,56 @@
+"""
+Compiler and SVM benchmarks: lexer tokens/sec, parser nodes/sec and SVM TPS.
+
+Run from the SeirChain directory (normally via benchmarks.run):
+
+    python -m benchmarks.bench_compiler --params '{"functions": 50}'
+"""
+
+import argparse
+import json
+from typing import Any, Dict
+from ast import *
+from lexer import Lexer
+from parser import Parser
+from visitor import children_of
+from benchmarks.generators import generate_cry_source
+from benchmarks.results import measure, result
+from benchmarks import svm_tps
+
+def count_nodes(root: Node) -> int:
+    count = 0
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(children_of(node))
+    return count
+
+def run(params: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    repeat = params["repeat"]
+    source = generate_cry_source(params["functions"], params["statements"], params["nesting"], params["seed"])
+    results = {}
+
+    tokens = Lexer(source).tokenize()
+    elapsed = measure(lambda: Lexer(source).tokenize(), repeat)
+    results["lexer_tokens_per_sec"] = result(len(tokens) / elapsed, "tokens/s")
+
+    nodes = count_nodes(Parser(tokens).parse())
+    elapsed = measure(lambda: Parser(tokens).parse(), repeat)
+    results["parser_nodes_per_sec"] = result(nodes / elapsed, "nodes/s")
+
+    transactions = svm_tps.generate_transactions(params["transactions"], params["accounts"], params["seed"])
+    best = min(svm_tps.run(transactions, params["accounts"], params["workers"])[1] for _ in range(repeat))
+    results["svm_transfer_tps"] = result(len(transactions) / best, "tx/s")
+    best = min(svm_tps.run_sequential(transactions, params["accounts"])[1] for _ in range(repeat))
+    results["svm_sequential_tps"] = result(len(transactions) / best, "tx/s")
+    return results
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Compiler and SVM benchmarks")
+    arg_parser.add_argument("--params", required=True, help="benchmark parameters as JSON")
+    args = arg_parser.parse_args()
+    print(json.dumps(run(json.loads(args.params))))
+
+if __name__ == "__main__":
+    main()
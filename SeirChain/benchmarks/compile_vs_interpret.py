@@ -0,0 +1,114 @@
+"""
+Micro-benchmark: contracts compiled to Python bytecode vs. direct AST interpretation.
+
+Run from the SeirChain directory:
+
+    python -m benchmarks.compile_vs_interpret --calls 20000
+"""
+
+import argparse
+import functools
+import time
+from typing import Any, Dict, List
+from ast import *
+from lexer import Lexer
+from parser import Parser
+from pycodegen import BytecodeCache, compile_source, load_contract
+from svm import BINARY_OPERATORS, BUILTINS, UNARY_OPERATORS, GlobalState, StateView
+
+CONTRACT = """
+function pay(sender: int, receiver: int, amount: int) {
+    immutable ok = transfer(sender, receiver, amount);
+    immutable remaining = balance(sender);
+    store(sender, remaining * 2 + amount % 7 - (remaining / 3));
+    parallel {
+        balance(receiver);
+        load(sender);
+    }
+}
+"""
+
+class ASTInterpreter:
+    """Tree-walking baseline that evaluates the AST on every call."""
+
+    def __init__(self, program: Program, env: Dict[str, Any]):
+        self.env = env
+        self.functions = {decl.name: decl for decl in program.declarations if isinstance(decl, FunctionDeclaration)}
+
+    def call(self, name: str, args: List[Any]) -> Any:
+        func = self.functions.get(name)
+        if func is None:
+            return self.env[name](*args)
+        scope = dict(zip((param.name for param in func.params), args))
+        self.execute_block(func.body, scope)
+        return None
+
+    def execute_block(self, node: Block, scope: Dict[str, Any]):
+        for stmt in node.statements:
+            if isinstance(stmt, VariableDeclaration):
+                scope[stmt.name] = self.evaluate(stmt.initializer, scope) if stmt.initializer else None
+            elif isinstance(stmt, ParallelBlock):
+                self.execute_block(stmt.body, scope)
+            else:
+                self.evaluate(stmt, scope)
+
+    def evaluate(self, node: Expression, scope: Dict[str, Any]) -> Any:
+        if isinstance(node, Literal):
+            return node.value
+        if isinstance(node, Identifier):
+            return scope[node.name]
+        if isinstance(node, BinaryExpression):
+            left = self.evaluate(node.left, scope)
+            if node.operator == "&&":
+                return left and self.evaluate(node.right, scope)
+            if node.operator == "||":
+                return left or self.evaluate(node.right, scope)
+            return BINARY_OPERATORS[node.operator](left, self.evaluate(node.right, scope))
+        if isinstance(node, UnaryExpression):
+            return UNARY_OPERATORS[node.operator](self.evaluate(node.operand, scope))
+        return self.call(node.callee.name, [self.evaluate(arg, scope) for arg in node.arguments])
+
+def host_env(view: StateView) -> Dict[str, Any]:
+    return {name: functools.partial(builtin, view) for name, builtin in BUILTINS.items()}
+
+def fresh_view(accounts: int) -> StateView:
+    return StateView(GlobalState({f"balance:{account}": 1_000_000 for account in range(accounts)}))
+
+def timed(fn, calls: int, accounts: int) -> float:
+    start = time.perf_counter()
+    for i in range(calls):
+        fn(i % accounts, (i + 1) % accounts, 1)
+    return time.perf_counter() - start
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Compiled vs interpreted contract execution")
+    arg_parser.add_argument("--calls", type=int, default=20000)
+    arg_parser.add_argument("--accounts", type=int, default=100)
+    args = arg_parser.parse_args()
+
+    interp_view = fresh_view(args.accounts)
+    interpreter = ASTInterpreter(Parser(Lexer(CONTRACT).tokenize()).parse(), host_env(interp_view))
+    interp_time = timed(lambda *a: interpreter.call("pay", list(a)), args.calls, args.accounts)
+
+    compiled_view = fresh_view(args.accounts)
+    namespace = load_contract(CONTRACT, host_env(compiled_view))
+    compiled_time = timed(namespace["pay"], args.calls, args.accounts)
+
+    if interp_view.writes != compiled_view.writes:
+        raise SystemExit("Compiled contract diverged from the interpreter")
+
+    cache = BytecodeCache()
+    start = time.perf_counter()
+    compile_source(CONTRACT, cache)
+    cold = time.perf_counter() - start
+    start = time.perf_counter()
+    compile_source(CONTRACT, cache)
+    warm = time.perf_counter() - start
+
+    print(f"calls: {args.calls}")
+    print(f"AST interpreter: {args.calls / interp_time:,.0f} calls/sec")
+    print(f"compiled:        {args.calls / compiled_time:,.0f} calls/sec ({interp_time / compiled_time:.1f}x)")
+    print(f"compile: {cold * 1e3:.2f} ms cold, {warm * 1e6:.1f} us cached")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Deterministic generators for benchmark inputs.
+
+Only the standard library is imported at module level so this module can be
+loaded both from the compiler (SeirChain directory on sys.path) and from the
+ledger benchmarks (repository root on sys.path).
+"""
+
+import hashlib
+import json
+import random
+from typing import List, Tuple
+
+BUILTIN_CALLS = (("balance", 1), ("load", 1), ("store", 2), ("transfer", 3), ("mint", 2))
+ARITHMETIC_OPERATORS = ("+", "-", "*", "/", "%", "<", "==", "&&")
+
+def _nested_call(rng: random.Random, names: List[Tuple[str, int]], scope: List[str], depth: int) -> str:
+    if depth == 0 or rng.random() < 0.2:
+        if scope and rng.random() < 0.5:
+            return rng.choice(scope)
+        return str(rng.randint(0, 1000))
+    if rng.random() < 0.4:
+        left = _nested_call(rng, names, scope, depth - 1)
+        right = _nested_call(rng, names, scope, depth - 1)
+        return f"({left} {rng.choice(ARITHMETIC_OPERATORS)} {right})"
+    name, arity = rng.choice(names)
+    args = ", ".join(_nested_call(rng, names, scope, depth - 1) for _ in range(arity))
+    return f"{name}({args})"
+
+def _statements(rng: random.Random, names, scope: List[str], count: int, nesting: int, indent: str) -> List[str]:
+    lines = []
+    for i in range(count):
+        roll = rng.random()
+        if nesting > 0 and roll < 0.1:
+            lines.append(f"{indent}parallel {{")
+            lines.extend(_statements(rng, names, list(scope), max(2, count // 4), nesting - 1, indent + "    "))
+            lines.append(f"{indent}}}")
+        elif roll < 0.6:
+            var = f"v{len(scope)}_{i}"
+            keyword = "mutable" if rng.random() < 0.3 else "immutable"
+            lines.append(f"{indent}{keyword} {var}: int = {_nested_call(rng, names, scope, nesting)};")
+            scope.append(var)
+        else:
+            lines.append(f"{indent}{_nested_call(rng, names, scope, max(1, nesting))};")
+    return lines
+
+def generate_cry_source(functions: int = 20, statements: int = 20, nesting: int = 3, seed: int = 0) -> str:
+    """A synthetic .cry program with `functions` functions of `statements` statements each.
+
+    `nesting` bounds both the depth of nested call and arithmetic
+    expressions and of `parallel` blocks. Functions only call SVM builtins and functions
+    declared before them, so every call resolves on the SVM. SemanticAnalyzer knows
+    neither the SVM builtins nor function parameters, so it rejects the output.
+    """
+    rng = random.Random(seed)
+    lines = []
+    for t in range(max(1, functions // 10)):
+        lines.append(f"triad Account{t} {{")
+        lines.append("    owner: int;")
+        lines.append("    balance: int;")
+        lines.append("    history: int[16];")
+        lines.append("}")
+    names = list(BUILTIN_CALLS)
+    for f in range(functions):
+        name = f"f{f}"
+        params = [f"p{i}" for i in range(rng.randint(1, 3))]
+        prefix = "fractal function" if rng.random() < 0.2 else "function"
+        params_str = ", ".join(f"{param}: int" for param in params)
+        lines.append(f"{prefix} {name}({params_str}) {{")
+        lines.extend(_statements(rng, names, list(params), statements, nesting, "    "))
+        lines.append("}")
+        names.append((name, len(params)))
+    return "\n".join(lines) + "\n"
+
+class TriadRecord:
+    """A synthetic triad: ternary coordinate, parent link and transaction payloads."""
+
+    def __init__(self, coordinate: Tuple[int, ...], parent_hash: bytes, transactions: List[bytes]):
+        self.coordinate = coordinate
+        self.parent_hash = parent_hash
+        self.transactions = transactions
+        self.merkle_root = merkle_root(transactions)
+        self.id = hashlib.sha256(bytes(coordinate) + parent_hash + self.merkle_root).digest()
+
+    def header(self) -> bytes:
+        return self.id + self.parent_hash + self.merkle_root
+
+def merkle_root(leaves: List[bytes]) -> bytes:
+    level = [hashlib.sha256(leaf).digest() for leaf in leaves] or [hashlib.sha256(b"").digest()]
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        level = [hashlib.sha256(level[i] + level[i + 1]).digest() for i in range(0, len(level), 2)]
+    return level[0]
+
+def _transaction(rng: random.Random, accounts: int) -> bytes:
+    sender, receiver = rng.sample(range(accounts), 2)
+    tx = {
+        "from": hashlib.sha256(sender.to_bytes(8, "big")).hexdigest()[:40],
+        "to": hashlib.sha256(receiver.to_bytes(8, "big")).hexdigest()[:40],
+        "amount": rng.randint(1, 10 ** 9),
+        "fee": rng.randint(1, 10 ** 4),
+        "nonce": rng.randint(0, 2 ** 32),
+        "signature": rng.getrandbits(512).to_bytes(64, "big").hex(),
+    }
+    return json.dumps(tx, sort_keys=True).encode()
+
+def generate_triad_matrix(depth: int = 5, transactions_per_triad: int = 8, accounts: int = 10000,
+                          seed: int = 0) -> List[TriadRecord]:
+    """All (3^(depth+1) - 1) / 2 triads of a Triad Matrix of the given depth, breadth first."""
+    rng = random.Random(seed)
+    root = TriadRecord((), b"\x00" * 32, [_transaction(rng, accounts) for _ in range(transactions_per_triad)])
+    records = [root]
+    level = [root]
+    for _ in range(depth):
+        next_level = []
+        for parent in level:
+            for digit in range(3):
+                txs = [_transaction(rng, accounts) for _ in range(transactions_per_triad)]
+                next_level.append(TriadRecord(parent.coordinate + (digit,), parent.id, txs))
+        records.extend(next_level)
+        level = next_level
+    return records
+
+def build_triads(records: List[TriadRecord]):
+    """Materialize records as stdlib Triad objects (requires the ledger packages)."""
+    from SeirChain.stdlib.triad_matrix import Triad
+    triads = []
+    for record in records:
+        triad = Triad(id=record.id)
+        triad.coordinate = record.coordinate
+        triad.parent_hash = record.parent_hash
+        triad.transactions = record.transactions
+        triad.update_merkle_root()
+        triads.append(triad)
+    return triads
@@ -0,0 +1,37 @@
+"""
+Benchmark result records, timing helpers and baseline comparison.
+
+Only the standard library is imported so both benchmark groups can use it.
+"""
+
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+def measure(fn: Callable[[], Any], repeat: int = 3) -> float:
+    """Best wall-clock time of `repeat` runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def result(value: float, unit: str, higher_is_better: bool = True) -> Dict[str, Any]:
+    return {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+
+def skipped(reason: str) -> Dict[str, Any]:
+    return {"skipped": reason}
+
+def compare(current: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+            threshold: float) -> List[Tuple[str, float, float, float, bool]]:
+    """(name, baseline, current, relative change, regressed) for benchmarks present in both runs."""
+    rows = []
+    for name, base in baseline.items():
+        cur = current.get(name)
+        if cur is None or "value" not in cur or "value" not in base or not base["value"]:
+            continue
+        change = (cur["value"] - base["value"]) / base["value"]
+        if not cur.get("higher_is_better", True):
+            change = -change
+        rows.append((name, base["value"], cur["value"], change, change < -threshold))
+    return rows
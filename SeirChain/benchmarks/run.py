@@ -0,0 +1,102 @@
+"""
+Reproducible benchmark suite.
+
+Runs every benchmark group on deterministic synthetic inputs, stores the
+results as JSON and optionally compares them against a baseline run,
+exiting non-zero when a benchmark regressed by more than the threshold.
+Run from the SeirChain directory:
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --baseline results.json --threshold 0.1
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from benchmarks.results import compare
+
+SEIRCHAIN_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_ROOT = os.path.dirname(SEIRCHAIN_DIR)
+
+# (module, working directory): each group runs in its own interpreter, see bench_ledger
+GROUPS = (
+    ("benchmarks.bench_compiler", SEIRCHAIN_DIR),
+    ("SeirChain.benchmarks.bench_ledger", REPO_ROOT),
+)
+
+def run_group(module: str, cwd: str, params):
+    completed = subprocess.run(
+        [sys.executable, "-m", module, "--params", json.dumps(params)],
+        cwd=cwd, capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        raise SystemExit(f"Benchmark group {module} failed:\n{completed.stderr}")
+    return json.loads(completed.stdout)
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Run the SeirChain benchmark suite")
+    arg_parser.add_argument("--output", help="write results JSON to this path")
+    arg_parser.add_argument("--baseline", help="compare against a previous results JSON")
+    arg_parser.add_argument("--threshold", type=float, default=0.10,
+                            help="relative slowdown that counts as a regression (default 0.10)")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark, best is kept")
+    arg_parser.add_argument("--functions", type=int, default=50, help="functions in the synthetic .cry corpus")
+    arg_parser.add_argument("--statements", type=int, default=30, help="statements per synthetic function")
+    arg_parser.add_argument("--nesting", type=int, default=3, help="expression and parallel block nesting depth")
+    arg_parser.add_argument("--depth", type=int, default=6, help="depth of the synthetic Triad Matrix")
+    arg_parser.add_argument("--transactions-per-triad", type=int, default=8)
+    arg_parser.add_argument("--transactions", type=int, default=5000, help="SVM transactions per block")
+    arg_parser.add_argument("--accounts", type=int, default=1000, help="SVM accounts")
+    arg_parser.add_argument("--workers", type=int, default=8, help="SVM worker threads")
+    arg_parser.add_argument("--lookups", type=int, default=1000, help="TriadStore gets and range queries")
+    args = arg_parser.parse_args()
+
+    params = {key: value for key, value in vars(args).items() if key not in ("output", "baseline", "threshold")}
+    results = {}
+    for module, cwd in GROUPS:
+        results.update(run_group(module, cwd, params))
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "cpu_count": os.cpu_count(),
+        },
+        "params": params,
+        "results": results,
+    }
+
+    for name, entry in results.items():
+        if "skipped" in entry:
+            print(f"{name:<30} skipped ({entry['skipped']})")
+        else:
+            print(f"{name:<30} {entry['value']:>16,.2f} {entry['unit']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("params") != params:
+            print("Warning: baseline was recorded with different parameters")
+        regressions = 0
+        print(f"\nComparison against {args.baseline} (threshold {args.threshold:.0%}):")
+        for name, base, cur, change, regressed in compare(results, baseline["results"], args.threshold):
+            flag = "REGRESSION" if regressed else ""
+            print(f"{name:<30} {base:>16,.2f} -> {cur:>16,.2f} {change:+8.1%} {flag}")
+            regressions += regressed
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+TPS benchmark for the SVM on synthetic token-transfer contracts.
+
+Run from the SeirChain directory:
+
+    python -m benchmarks.svm_tps --transactions 10000 --accounts 1000 --workers 8
+"""
+
+import argparse
+import random
+import time
+from lexer import Lexer
+from parser import Parser
+from svm import SVM
+
+TRANSFER_CONTRACT = """
+function pay(sender: int, receiver: int, amount: int) {
+    transfer(sender, receiver, amount);
+}
+
+function pay_pair(a: int, b: int, c: int, d: int, amount: int) {
+    parallel {
+        transfer(a, b, amount);
+        transfer(c, d, amount);
+    }
+}
+"""
+
+def generate_transactions(count: int, accounts: int, seed: int):
+    rng = random.Random(seed)
+    transactions = []
+    for _ in range(count):
+        sender, receiver = rng.sample(range(accounts), 2)
+        transactions.append(("pay", [sender, receiver, rng.randint(1, 10)]))
+    return transactions
+
+def initial_state(accounts: int, balance: int = 1_000_000):
+    return {f"balance:{account}": balance for account in range(accounts)}
+
+def build(accounts: int, workers: int) -> SVM:
+    program = Parser(Lexer(TRANSFER_CONTRACT).tokenize()).parse()
+    return SVM(program, initial_state(accounts), workers=workers)
+
+def run_sequential(transactions, accounts: int):
+    """Baseline without any scheduler: one SVM.invoke per transaction."""
+    svm = build(accounts, workers=1)
+    failed = 0
+    start = time.perf_counter()
+    for name, args in transactions:
+        try:
+            svm.invoke(name, args)
+        except Exception:
+            failed += 1
+    elapsed = time.perf_counter() - start
+    svm.close()
+    return svm, elapsed, failed
+
+def run(transactions, accounts: int, workers: int):
+    svm = build(accounts, workers)
+    start = time.perf_counter()
+    results = svm.execute_block(transactions)
+    elapsed = time.perf_counter() - start
+    svm.close()
+    failed = sum(1 for result in results if not result.success)
+    return svm, elapsed, failed
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="SVM token-transfer TPS benchmark")
+    arg_parser.add_argument("--transactions", type=int, default=10000)
+    arg_parser.add_argument("--accounts", type=int, default=1000,
+                            help="fewer accounts means more read/write conflicts")
+    arg_parser.add_argument("--workers", type=int, default=8)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    transactions = generate_transactions(args.transactions, args.accounts, args.seed)
+    serial, serial_time, _ = run_sequential(transactions, args.accounts)
+    parallel, parallel_time, failed = run(transactions, args.accounts, workers=args.workers)
+    if parallel.state.data != serial.state.data:
+        raise SystemExit("Parallel execution diverged from serial execution")
+
+    stats = parallel.stats
+    serial_tps = args.transactions / serial_time
+    parallel_tps = args.transactions / parallel_time
+    print(f"transactions: {args.transactions}  accounts: {args.accounts}  workers: {args.workers}")
+    print(f"sequential invoke: {serial_tps:,.0f} TPS")
+    print(f"execute_block:     {parallel_tps:,.0f} TPS ({parallel_tps / serial_tps:.2f}x sequential)")
+    print(f"rounds: {stats.rounds}  executions: {stats.executions}  aborts: {stats.aborts}  failed: {failed}")
+
+if __name__ == "__main__":
+    main()
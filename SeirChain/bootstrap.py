@@ -0,0 +1,72 @@
+"""
+Loads the flat compiler modules next to the standard library `ast`.
+
+The compiler's ast.py shadows the standard library module of the same name,
+which asyncio, inspect and dataclasses need (the storage layer, the metrics
+exporter and pytest all pull them in). `load_compiler` first imports such
+dependencies against the standard library module, then imports the compiler
+modules with the compiler's ast.py swapped in, and finally puts the standard
+library module back. Compiler modules bind their node classes with
+`from ast import *`, so they keep working after the swap.
+"""
+
+import importlib
+import importlib.util
+import os
+import sys
+from types import ModuleType
+from typing import Dict, Iterable, Optional
+
+COMPILER_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(COMPILER_DIR)
+
+# Shared by every load_compiler call, so all compiler modules see the same node classes
+_compiler_ast: Optional[ModuleType] = None
+
+def _in_compiler_dir(path: str) -> bool:
+    return os.path.abspath(path or os.curdir) == COMPILER_DIR
+
+def _is_compiler_ast(module: ModuleType) -> bool:
+    return _in_compiler_dir(os.path.dirname(module.__file__))
+
+def _stdlib_ast() -> ModuleType:
+    module = sys.modules.get("ast")
+    if module is not None and not _is_compiler_ast(module):
+        return module
+    saved_path = sys.path[:]
+    sys.path[:] = [path for path in sys.path if not _in_compiler_dir(path)]
+    sys.modules.pop("ast", None)
+    try:
+        return importlib.import_module("ast")
+    finally:
+        sys.path[:] = saved_path
+
+def _load_compiler_ast() -> ModuleType:
+    global _compiler_ast
+    if _compiler_ast is None:
+        module = sys.modules.get("ast")
+        if module is not None and _is_compiler_ast(module):
+            _compiler_ast = module
+        else:
+            spec = importlib.util.spec_from_file_location("ast", os.path.join(COMPILER_DIR, "ast.py"))
+            _compiler_ast = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(_compiler_ast)
+    return _compiler_ast
+
+def load_compiler(modules: Iterable[str], dependencies: Iterable[str] = ()) -> Dict[str, ModuleType]:
+    """Import compiler `modules` after `dependencies` that need the standard library ast.
+
+    Afterwards both kinds can be imported normally, since they are cached in sys.modules.
+    """
+    for path in (REPO_ROOT, COMPILER_DIR):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    compiler_ast = _load_compiler_ast()
+    stdlib_ast = _stdlib_ast()
+    for name in dependencies:
+        importlib.import_module(name)
+    sys.modules["ast"] = compiler_ast
+    try:
+        return {name: importlib.import_module(name) for name in modules}
+    finally:
+        sys.modules["ast"] = stdlib_ast
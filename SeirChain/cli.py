@@ -1,16 +1,57 @@
+import argparse
+import os
 import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bootstrap import load_compiler
+
+# The ledger modules need the standard library ast, so they import before the compiler's
+LEDGER_MODULES = (
+    "SeirChain.stdlib.triad_matrix",
+    "SeirChain.stdlib.triad_store",
+    "SeirChain.stdlib.pof_consensus",
+    "SeirChain.stdlib.metrics",
+)
+load_compiler(("lexer", "parser", "visitor", "semantic", "codegen"), LEDGER_MODULES)
+
 from lexer import Lexer
 from parser import Parser
-from stdlib.triad_matrix import Triad
-from stdlib.triad_store import TriadStore
-from stdlib.pof_consensus import ProofOfFractalConsensus
+from semantic import SemanticAnalyzer, SemanticError
+from codegen import CodeGenerator
+from visitor import walk
+from SeirChain.stdlib.triad_matrix import Triad
+from SeirChain.stdlib.triad_store import TriadStore
+from SeirChain.stdlib.pof_consensus import ProofOfFractalConsensus
+from SeirChain.stdlib.metrics import REGISTRY, MetricsServer, profiled
+
+# Semantic analysis and code generation share one fused walk over the AST
+PHASES = ("lex", "parse", "passes")
+PHASE_METRIC = "compiler_phase_seconds"
+PHASE_HELP = "Time spent in each compiler phase"
+
+def phase(name: str):
+    return REGISTRY.timer(PHASE_METRIC, PHASE_HELP, phase=name)
+
+def print_profile():
+    print("Compiler phase timings:")
+    total = 0.0
+    for name in PHASES:
+        elapsed = REGISTRY.histogram(PHASE_METRIC, PHASE_HELP, phase=name).sum
+        total += elapsed
+        print(f"  {name:<8} {elapsed * 1000:10.3f} ms")
+    print(f"  {'total':<8} {total * 1000:10.3f} ms")
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python cli.py <source-file.cry>")
-        sys.exit(1)
+    arg_parser = argparse.ArgumentParser(description="Compile a Crysilis (.cry) source file")
+    arg_parser.add_argument("source_file")
+    arg_parser.add_argument("--profile", action="store_true", help="print per-phase compiler timings")
+    arg_parser.add_argument("--metrics-port", type=int, help="serve Prometheus metrics on this local port")
+    arg_parser.add_argument("--cprofile", metavar="PATH", help="write cProfile stats of the compilation to PATH")
+    arg_parser.add_argument("--tracemalloc", metavar="PATH", help="write a tracemalloc snapshot of the compilation to PATH")
+    args = arg_parser.parse_args()
 
-    source_file = sys.argv[1]
+    source_file = args.source_file
     try:
         with open(source_file, "r") as f:
             source_code = f.read()
@@ -18,19 +59,36 @@ def main():
         print(f"File not found: {source_file}")
         sys.exit(1)
 
-    lexer = Lexer(source_code)
-    tokens = lexer.tokenize()
+    triad_store = TriadStore(db_path="triad_db", metrics=REGISTRY)
+
+    with profiled(args.cprofile, args.tracemalloc):
+        with phase("lex"):
+            lexer = Lexer(source_code)
+            tokens = lexer.tokenize()
+
+        with phase("parse"):
+            parser = Parser(tokens)
+            ast = parser.parse()
 
-    parser = Parser(tokens)
-    ast = parser.parse()
+        print("Parsing successful. AST:")
+        print(ast)
 
-    print("Parsing successful. AST:")
-    print(ast)
+        try:
+            with phase("passes"):
+                _, output = walk(ast, SemanticAnalyzer(triad_store), CodeGenerator(triad_store))
+        except SemanticError as e:
+            print(f"Semantic error: {e}")
+            sys.exit(1)
+
+    print("Generated code:")
+    print(output)
+
+    if args.profile:
+        print_profile()
 
     # Example usage of Triad and TriadStore
     triad_id = b"example_triad_id_1234"
     triad = Triad(id=triad_id)
-    triad_store = TriadStore(db_path="triad_db")
     # Note: put_triad is async, so in real code we would await it or run in event loop
     # Here just a placeholder call
     # await triad_store.put_triad(triad)
@@ -40,5 +98,13 @@ def main():
     puzzle = pof.generate_puzzle(triad_id, (0,0,0))
     print(f"Generated PoF puzzle with difficulty: {puzzle.difficulty_target}")
 
+    if args.metrics_port is not None:
+        server = MetricsServer(REGISTRY, port=args.metrics_port).start()
+        print(f"Serving metrics on http://127.0.0.1:{server.port}/metrics (Ctrl-C to exit)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.stop()
+
 if __name__ == "__main__":
     main()
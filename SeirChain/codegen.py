@@ -1,28 +1,29 @@
+from typing import Optional
 from ast import *
-from stdlib.triad_matrix import Triad
-from stdlib.triad_store import TriadStore
-from stdlib.pof_consensus import ProofOfFractalConsensus
+from visitor import NodeVisitor
+from SeirChain.stdlib.triad_matrix import Triad
+from SeirChain.stdlib.triad_store import TriadStore
+from SeirChain.stdlib.pof_consensus import ProofOfFractalConsensus
 
-class CodeGenerator:
-    def __init__(self):
+class CodeGenerator(NodeVisitor):
+    def __init__(self, triad_store: Optional[TriadStore] = None):
         self.output = []
-        self.triad_store = TriadStore(db_path="triad_db")
+        # Expressions used as statements are emitted as soon as they are generated
+        self.expression_statements = set()
+        # RocksDB allows one open handle per path, so callers can share a store
+        self.triad_store = triad_store or TriadStore(db_path="triad_db")
         self.pof_consensus = ProofOfFractalConsensus()
 
     def generate(self, node: Node):
-        method_name = f"generate_{type(node).__name__}"
-        method = getattr(self, method_name, self.generic_generate)
-        return method(node)
+        return self.visit(node)
 
-    def generic_generate(self, node: Node):
-        raise NotImplementedError(f"No generate_{type(node).__name__} method")
+    def generic_visit(self, node: Node):
+        raise NotImplementedError(f"Cannot generate code for {type(node).__name__} node")
 
-    def generate_Program(self, node: Program):
-        for decl in node.declarations:
-            self.generate(decl)
-        return "\\n".join(self.output)
+    def leave_Program(self, node: Program, values):
+        return "\n".join(self.output)
 
-    def generate_TriadDeclaration(self, node: TriadDeclaration):
+    def enter_TriadDeclaration(self, node: TriadDeclaration):
         self.output.append(f"struct {node.name} {{")
         for field in node.fields:
             type_str = field.type_name
@@ -36,44 +37,60 @@ class CodeGenerator:
         # Store triad asynchronously (placeholder)
         # await self.triad_store.put_triad(triad)
 
-    def generate_FunctionDeclaration(self, node: FunctionDeclaration):
+    def enter_FunctionDeclaration(self, node: FunctionDeclaration):
         ret_type = node.return_type or "void"
         params_str = ", ".join(f"{param.type_name} {param.name}" for param in node.params)
         self.output.append(f"{ret_type} {node.name}({params_str}) {{")
-        self.generate(node.body)
+
+    def leave_FunctionDeclaration(self, node: FunctionDeclaration, values):
         self.output.append("}")
 
-    def generate_Block(self, node: Block):
+    def enter_Block(self, node: Block):
         for stmt in node.statements:
-            self.generate(stmt)
+            if isinstance(stmt, Expression):
+                self.expression_statements.add(id(stmt))
+
+    def enter_ParallelBlock(self, node: ParallelBlock):
+        self.output.append("/* parallel */ {")
+
+    def leave_ParallelBlock(self, node: ParallelBlock, values):
+        self.output.append("}")
 
-    def generate_VariableDeclaration(self, node: VariableDeclaration):
+    def leave_VariableDeclaration(self, node: VariableDeclaration, values):
         type_str = node.type_name or "auto"
         mut_str = "mutable " if node.mutable else ""
         init_str = ""
         if node.initializer:
-            init_str = " = " + self.generate_expression(node.initializer)
+            init_str = " = " + values[0]
         self.output.append(f"{mut_str}{type_str} {node.name}{init_str};")
 
     def generate_expression(self, node: Node) -> str:
-        method_name = f"generate_expr_{type(node).__name__}"
-        method = getattr(self, method_name, self.generic_generate_expr)
-        return method(node)
+        return self.visit(node)
+
+    def expression(self, node: Expression, text: str) -> str:
+        if id(node) in self.expression_statements:
+            self.output.append(f"{text};")
+        return text
+
+    def leave_CallExpression(self, node: CallExpression, values) -> str:
+        args_str = ", ".join(values)
+        return self.expression(node, f"{node.callee.name}({args_str})")
 
-    def generic_generate_expr(self, node: Node) -> str:
-        raise NotImplementedError(f"No generate_expr_{type(node).__name__} method")
+    def leave_BinaryExpression(self, node: BinaryExpression, values) -> str:
+        return self.expression(node, f"({values[0]} {node.operator} {values[1]})")
 
-    def generate_expr_CallExpression(self, node: CallExpression) -> str:
-        args_str = ", ".join(self.generate_expression(arg) for arg in node.args)
-        return f"{node.callee.name}({args_str})"
+    def leave_UnaryExpression(self, node: UnaryExpression, values) -> str:
+        return self.expression(node, f"{node.operator}{values[0]}")
 
-    def generate_expr_Identifier(self, node: Identifier) -> str:
-        return node.name
+    def leave_Identifier(self, node: Identifier, values) -> str:
+        return self.expression(node, node.name)
 
-    def generate_expr_Literal(self, node: Literal) -> str:
+    def leave_Literal(self, node: Literal, values) -> str:
         if isinstance(node.value, str):
-            return f'"{node.value}"'
+            escaped = node.value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            text = f'"{escaped}"'
         elif isinstance(node.value, bool):
-            return "true" if node.value else "false"
+            text = "true" if node.value else "false"
         else:
-            return str(node.value)
+            text = str(node.value)
+        return self.expression(node, text)
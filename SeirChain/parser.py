@@ -1,11 +1,59 @@
-from typing import List, Optional
+import re
+from typing import List, Optional, Tuple
 from lexer import Lexer, Token, TokenType
 from ast import *
+from arena import ExpressionArena
+
+# Left and right binding powers of infix operators. A right power one above
+# the left one makes the operator left-associative.
+INFIX_BINDING_POWER = {
+    TokenType.OR: (10, 11),
+    TokenType.AND: (20, 21),
+    TokenType.EQUAL: (30, 31),
+    TokenType.NOTEQUAL: (30, 31),
+    TokenType.LESS: (40, 41),
+    TokenType.LESSEQUAL: (40, 41),
+    TokenType.GREATER: (40, 41),
+    TokenType.GREATEREQUAL: (40, 41),
+    TokenType.PLUS: (50, 51),
+    TokenType.MINUS: (50, 51),
+    TokenType.STAR: (60, 61),
+    TokenType.SLASH: (60, 61),
+    TokenType.PERCENT: (60, 61),
+}
+
+PREFIX_BINDING_POWER = {
+    TokenType.MINUS: 70,
+    TokenType.NOT: 70,
+}
+
+LITERAL_TOKENS = (TokenType.NUMBER, TokenType.STRING, TokenType.TRUE, TokenType.FALSE, TokenType.UNCERTAIN)
+
+# Operator stack entry kinds; operators sort before brackets
+_PREFIX = 0
+_INFIX = 1
+_GROUP = 2
+_CALL = 3
+
+STRING_ESCAPES = {"n": "\n", "t": "\t", "r": "\r"}
+
+def literal_value(token: Token):
+    if token.type == TokenType.NUMBER:
+        return int(token.value)
+    elif token.type == TokenType.STRING:
+        return re.sub(r"\\(.)", lambda m: STRING_ESCAPES.get(m.group(1), m.group(1)), token.value[1:-1])
+    elif token.type == TokenType.TRUE:
+        return True
+    elif token.type == TokenType.FALSE:
+        return False
+    else:
+        return "uncertain"
 
 class Parser:
     def __init__(self, tokens: List[Token]):
         self.tokens = tokens
         self.position = 0
+        self.arena = ExpressionArena()
 
     def current_token(self) -> Token:
         return self.tokens[self.position]
@@ -89,24 +137,42 @@ class Parser:
         return params
 
     def parse_block(self) -> Block:
+        # Nested parallel blocks are kept on an explicit stack of open
+        # statement lists instead of recursing, like expressions
         self.consume(TokenType.LBRACE)
-        statements = []
-        while self.current_token().type != TokenType.RBRACE:
-            stmt = self.parse_statement()
-            statements.append(stmt)
-        self.consume(TokenType.RBRACE)
-        return Block(statements)
+        open_blocks: List[List[Node]] = [[]]
+        while True:
+            token_type = self.current_token().type
+            if token_type == TokenType.RBRACE:
+                self.position += 1
+                block = Block(open_blocks.pop())
+                if not open_blocks:
+                    return block
+                open_blocks[-1].append(ParallelBlock(block))
+            elif token_type == TokenType.PARALLEL:
+                self.consume(TokenType.PARALLEL)
+                self.consume(TokenType.LBRACE)
+                open_blocks.append([])
+            else:
+                open_blocks[-1].append(self.parse_statement())
 
     def parse_statement(self) -> Node:
         # For simplicity, parse variable declarations and expressions here
         token = self.current_token()
         if token.type in (TokenType.IMMUTABLE, TokenType.MUTABLE):
             return self.parse_variable_declaration()
+        elif token.type == TokenType.PARALLEL:
+            return self.parse_parallel_block()
         else:
             expr = self.parse_expression()
             self.consume(TokenType.SEMICOLON)
             return expr
 
+    def parse_parallel_block(self) -> ParallelBlock:
+        self.consume(TokenType.PARALLEL)
+        body = self.parse_block()
+        return ParallelBlock(body)
+
     def parse_variable_declaration(self) -> VariableDeclaration:
         mutable = self.current_token().type == TokenType.MUTABLE
         self.consume(self.current_token().type)
@@ -123,38 +189,90 @@ class Parser:
         return VariableDeclaration(name, type_name, mutable, initializer)
 
     def parse_expression(self) -> Expression:
-        # For now, parse identifiers, literals, and call expressions
-        token = self.current_token()
-        if token.type == TokenType.IDENTIFIER:
-            id_name = token.value
-            self.consume(TokenType.IDENTIFIER)
-            if self.current_token().type == TokenType.LPAREN:
-                self.consume(TokenType.LPAREN)
-                args = []
-                if self.current_token().type != TokenType.RPAREN:
-                    while True:
-                        arg = self.parse_expression()
-                        args.append(arg)
-                        if self.current_token().type == TokenType.COMMA:
-                            self.consume(TokenType.COMMA)
+        return self.arena.view(self.parse_expression_index())
+
+    def parse_expression_index(self) -> int:
+        # Pratt parser driven by explicit operand/operator stacks instead of
+        # recursion, so nesting depth is bounded only by memory. Returns the
+        # arena index of the parsed expression.
+        arena = self.arena
+        tokens = self.tokens
+        operands: List[int] = []
+        # (kind, right binding power, operator, position): the operator's start for
+        # prefix/infix entries, the LPAREN for groups, the operand height for calls
+        operators: List[Tuple[int, int, str, int]] = []
+        expect_operand = True
+        while True:
+            token = tokens[self.position]
+            token_type = token.type
+            if expect_operand:
+                if token_type in PREFIX_BINDING_POWER:
+                    operators.append((_PREFIX, PREFIX_BINDING_POWER[token_type], token.value, token.position))
+                    self.position += 1
+                elif token_type == TokenType.LPAREN:
+                    operators.append((_GROUP, 0, token.value, token.position))
+                    self.position += 1
+                elif token_type == TokenType.IDENTIFIER:
+                    operands.append(arena.identifier(token.value, token.position, token.position + len(token.value)))
+                    self.position += 1
+                    if tokens[self.position].type == TokenType.LPAREN:
+                        self.position += 1
+                        if tokens[self.position].type == TokenType.RPAREN:
+                            end = tokens[self.position].position + 1
+                            self.position += 1
+                            operands.append(arena.call(operands.pop(), [], end))
+                            expect_operand = False
                         else:
-                            break
-                self.consume(TokenType.RPAREN)
-                return CallExpression(Identifier(id_name), args)
+                            operators.append((_CALL, 0, "(", len(operands)))
+                    else:
+                        expect_operand = False
+                elif token_type in LITERAL_TOKENS:
+                    operands.append(arena.literal(literal_value(token), token.position, token.position + len(token.value)))
+                    self.position += 1
+                    expect_operand = False
+                else:
+                    raise SyntaxError(f"Unexpected token {token.type} at position {token.position}")
+            elif token_type in INFIX_BINDING_POWER:
+                left_bp, right_bp = INFIX_BINDING_POWER[token_type]
+                self.reduce_operators(operands, operators, left_bp)
+                operators.append((_INFIX, right_bp, token.value, token.position))
+                self.position += 1
+                expect_operand = True
+            elif token_type in (TokenType.COMMA, TokenType.RPAREN):
+                self.reduce_operators(operands, operators, 0)
+                if not operators:
+                    # Belongs to the enclosing construct
+                    break
+                kind, _, _, position = operators[-1]
+                self.position += 1
+                if token_type == TokenType.COMMA:
+                    if kind != _CALL:
+                        raise SyntaxError(f"Unexpected token {token.type} at position {token.position}")
+                    expect_operand = True
+                else:
+                    operators.pop()
+                    if kind == _CALL:
+                        args = operands[position:]
+                        del operands[position:]
+                        operands.append(arena.call(operands.pop(), args, token.position + 1))
+                    else:
+                        # The grouped expression's span includes its parentheses
+                        arena.starts[operands[-1]] = position
+                        arena.ends[operands[-1]] = token.position + 1
             else:
-                return Identifier(id_name)
-        elif token.type == TokenType.NUMBER:
-            value = int(token.value)
-            self.consume(TokenType.NUMBER)
-            return Literal(value)
-        elif token.type == TokenType.TRUE:
-            self.consume(TokenType.TRUE)
-            return Literal(True)
-        elif token.type == TokenType.FALSE:
-            self.consume(TokenType.FALSE)
-            return Literal(False)
-        elif token.type == TokenType.UNCERTAIN:
-            self.consume(TokenType.UNCERTAIN)
-            return Literal("uncertain")
-        else:
-            raise SyntaxError(f"Unexpected token {token.type} at position {token.position}")
+                break
+        self.reduce_operators(operands, operators, 0)
+        if operators:
+            raise SyntaxError(f"Expected token {TokenType.RPAREN} but got {token.type} at position {token.position}")
+        return operands[0]
+
+    def reduce_operators(self, operands: List[int], operators: List[Tuple[int, int, str, int]], left_bp: int):
+        # Apply pending operators that bind tighter than the incoming one; brackets stop the reduction
+        arena = self.arena
+        while operators and operators[-1][0] <= _INFIX and operators[-1][1] > left_bp:
+            kind, _, operator, start = operators.pop()
+            if kind == _PREFIX:
+                operands.append(arena.unary(operator, operands.pop(), start))
+            else:
+                right = operands.pop()
+                operands.append(arena.binary(operator, operands.pop(), right))
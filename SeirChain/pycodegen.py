@@ -0,0 +1,218 @@
+"""
+Python back end: lowers Crysilis ASTs to CPython bytecode.
+
+Programs are translated into Python `ast` modules, compiled with `compile()`
+and cached as marshalled code objects keyed by a hash of the .cry source, so
+contracts run as native Python functions instead of being interpreted.
+"""
+
+# The local ast.py shadows the standard library module, so use its C core directly
+import _ast as pyast
+import builtins
+import hashlib
+import importlib.util
+import keyword
+import marshal
+import os
+from types import CodeType
+from typing import Any, Dict, List, Optional
+from ast import *
+from lexer import Lexer
+from parser import Parser
+from visitor import NodeVisitor
+
+# Part of every cache key: bump whenever the lowering below changes
+BACKEND_VERSION = 2
+
+# .cry identifiers that Python reserves (keywords, dunders) get this prefix, as
+# do identifiers already starting with it so the mapping stays one-to-one
+MANGLE_PREFIX = "_cry_"
+
+def mangle(name: str) -> str:
+    if keyword.iskeyword(name) or name.startswith("__") or name.startswith(MANGLE_PREFIX):
+        return MANGLE_PREFIX + name
+    return name
+
+# Parameters and variables live apart from functions, triads and host calls,
+# as in the SVM, so a local can share a name with the function it calls.
+# mangle never yields this prefix, since it prefixes names starting with MANGLE_PREFIX
+LOCAL_PREFIX = MANGLE_PREFIX + "local_"
+
+def local(name: str) -> str:
+    return LOCAL_PREFIX + name
+
+class CompileError(Exception):
+    pass
+
+def _located(node):
+    # compile() requires positions on every statement and expression
+    node.lineno = node.end_lineno = 1
+    node.col_offset = node.end_col_offset = 0
+    return node
+
+# .cry numbers are integers, so `/` is integer division (as in the SVM)
+BINARY_OPERATORS = {
+    "+": pyast.Add,
+    "-": pyast.Sub,
+    "*": pyast.Mult,
+    "/": pyast.FloorDiv,
+    "%": pyast.Mod,
+}
+COMPARE_OPERATORS = {
+    "==": pyast.Eq,
+    "!=": pyast.NotEq,
+    "<": pyast.Lt,
+    "<=": pyast.LtE,
+    ">": pyast.Gt,
+    ">=": pyast.GtE,
+}
+BOOL_OPERATORS = {
+    "&&": pyast.And,
+    "||": pyast.Or,
+}
+UNARY_OPERATORS = {
+    "-": pyast.USub,
+    "!": pyast.Not,
+}
+
+class PythonCodeGenerator(NodeVisitor):
+    def generate(self, node: Node) -> pyast.Module:
+        return self.visit(node)
+
+    @staticmethod
+    def statements(values: List[Any]) -> List[pyast.stmt]:
+        # Declarations produce statement lists, bare expressions need wrapping
+        body = []
+        for value in values:
+            if isinstance(value, list):
+                body.extend(value)
+            else:
+                body.append(_located(pyast.Expr(value=value)))
+        return body
+
+    def leave_Program(self, node: Program, values) -> pyast.Module:
+        return pyast.Module(body=self.statements(values), type_ignores=[])
+
+    def leave_TriadDeclaration(self, node: TriadDeclaration, values) -> List[pyast.stmt]:
+        slots = pyast.Tuple(elts=[_located(pyast.Constant(value=field.name)) for field in node.fields], ctx=pyast.Load())
+        assign = pyast.Assign(targets=[_located(pyast.Name(id="__slots__", ctx=pyast.Store()))], value=_located(slots))
+        return [_located(pyast.ClassDef(name=mangle(node.name), bases=[], keywords=[], body=[_located(assign)], decorator_list=[]))]
+
+    def leave_FunctionDeclaration(self, node: FunctionDeclaration, values) -> List[pyast.stmt]:
+        args = pyast.arguments(
+            posonlyargs=[],
+            args=[_located(pyast.arg(arg=local(param.name))) for param in node.params],
+            kwonlyargs=[],
+            kw_defaults=[],
+            defaults=[],
+        )
+        body = values[0] or [_located(pyast.Pass())]
+        return [_located(pyast.FunctionDef(name=mangle(node.name), args=args, body=body, decorator_list=[]))]
+
+    def leave_Block(self, node: Block, values) -> List[pyast.stmt]:
+        return self.statements(values)
+
+    def leave_ParallelBlock(self, node: ParallelBlock, values) -> List[pyast.stmt]:
+        # Branches are independent, so running them in order is a valid schedule
+        return values[0]
+
+    def leave_VariableDeclaration(self, node: VariableDeclaration, values) -> List[pyast.stmt]:
+        if node.initializer:
+            value = values[0]
+        else:
+            value = _located(pyast.Constant(value=None))
+        target = _located(pyast.Name(id=local(node.name), ctx=pyast.Store()))
+        return [_located(pyast.Assign(targets=[target], value=value))]
+
+    def leave_CallExpression(self, node: CallExpression, values) -> pyast.expr:
+        func = _located(pyast.Name(id=mangle(node.callee.name), ctx=pyast.Load()))
+        return _located(pyast.Call(func=func, args=values, keywords=[]))
+
+    def leave_BinaryExpression(self, node: BinaryExpression, values) -> pyast.expr:
+        left, right = values
+        if node.operator in BOOL_OPERATORS:
+            return _located(pyast.BoolOp(op=BOOL_OPERATORS[node.operator](), values=[left, right]))
+        if node.operator in COMPARE_OPERATORS:
+            return _located(pyast.Compare(left=left, ops=[COMPARE_OPERATORS[node.operator]()], comparators=[right]))
+        return _located(pyast.BinOp(left=left, op=BINARY_OPERATORS[node.operator](), right=right))
+
+    def leave_UnaryExpression(self, node: UnaryExpression, values) -> pyast.expr:
+        return _located(pyast.UnaryOp(op=UNARY_OPERATORS[node.operator](), operand=values[0]))
+
+    def leave_Identifier(self, node: Identifier, values) -> pyast.expr:
+        return _located(pyast.Name(id=local(node.name), ctx=pyast.Load()))
+
+    def leave_Literal(self, node: Literal, values) -> pyast.expr:
+        return _located(pyast.Constant(value=node.value))
+
+class BytecodeCache:
+    """Marshalled code objects keyed by source hash, in memory and optionally on disk."""
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir
+        self.entries: Dict[str, CodeType] = {}
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(source: str) -> str:
+        # Marshal output is only valid for the interpreter version that wrote it,
+        # and cached code is only current for the lowering that produced it
+        header = importlib.util.MAGIC_NUMBER + BACKEND_VERSION.to_bytes(4, "little")
+        return hashlib.sha256(header + source.encode()).hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.crypyc")
+
+    def get(self, key: str) -> Optional[CodeType]:
+        code = self.entries.get(key)
+        if code is None and self.cache_dir:
+            try:
+                with open(self.path(key), "rb") as f:
+                    code = marshal.load(f)
+            except (FileNotFoundError, EOFError, ValueError, TypeError):
+                return None
+            self.entries[key] = code
+        return code
+
+    def put(self, key: str, code: CodeType):
+        self.entries[key] = code
+        if self.cache_dir:
+            tmp_path = self.path(key) + ".tmp"
+            with open(tmp_path, "wb") as f:
+                marshal.dump(code, f)
+            os.replace(tmp_path, self.path(key))
+
+# Triad declarations lower to classes, which need the class-building hook
+CONTRACT_BUILTINS = {"__build_class__": builtins.__build_class__}
+
+def compile_source(source: str, cache: Optional[BytecodeCache] = None, filename: str = "<cry>") -> CodeType:
+    key = BytecodeCache.key(source)
+    if cache is not None:
+        code = cache.get(key)
+        if code is not None:
+            return code
+    program = Parser(Lexer(source).tokenize()).parse()
+    module = PythonCodeGenerator().generate(program)
+    try:
+        code = compile(module, filename, "exec")
+    except RecursionError:
+        # CPython's compiler recurses per nesting level, the SVM does not
+        raise CompileError(f"{filename}: expression nests too deeply for the Python back end, run it on the SVM") from None
+    if cache is not None:
+        cache.put(key, code)
+    return code
+
+def load_contract(source: str, env: Optional[Dict[str, Any]] = None,
+                  cache: Optional[BytecodeCache] = None) -> Dict[str, Any]:
+    """Compile and execute a .cry program, returning its namespace of functions.
+
+    `env` supplies the host functions (e.g. SVM builtins) the contract may call;
+    they are the only callables it can reach, since Python builtins are withheld.
+    Functions named after Python keywords are stored under `mangle(name)`.
+    """
+    namespace: Dict[str, Any] = {mangle(name): value for name, value in (env or {}).items()}
+    namespace["__builtins__"] = CONTRACT_BUILTINS
+    namespace["__name__"] = "cry"
+    exec(compile_source(source, cache), namespace)
+    return namespace
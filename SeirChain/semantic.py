@@ -1,8 +1,9 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from ast import *
-from stdlib.triad_matrix import Triad
-from stdlib.triad_store import TriadStore
-from stdlib.pof_consensus import ProofOfFractalConsensus
+from visitor import NodeVisitor
+from SeirChain.stdlib.triad_matrix import Triad
+from SeirChain.stdlib.triad_store import TriadStore
+from SeirChain.stdlib.pof_consensus import ProofOfFractalConsensus
 
 class SemanticError(Exception):
     pass
@@ -21,25 +22,23 @@ class SymbolTable:
             raise SemanticError(f"Symbol '{name}' not found")
         return self.symbols[name]
 
-class SemanticAnalyzer:
-    def __init__(self):
+class SemanticAnalyzer(NodeVisitor):
+    def __init__(self, triad_store: Optional[TriadStore] = None):
         self.symbol_table = SymbolTable()
-        self.triad_store = TriadStore(db_path="triad_db")
+        # RocksDB allows one open handle per path, so callers can share a store
+        self.triad_store = triad_store or TriadStore(db_path="triad_db")
         self.pof_consensus = ProofOfFractalConsensus()
 
     def analyze(self, node: Node):
-        method_name = f"analyze_{type(node).__name__}"
-        method = getattr(self, method_name, self.generic_analyze)
-        return method(node)
+        return self.visit(node)
 
-    def generic_analyze(self, node: Node):
-        raise SemanticError(f"No analyze_{type(node).__name__} method")
+    def generic_visit(self, node: Node):
+        raise SemanticError(f"Cannot analyze {type(node).__name__} node")
 
-    def analyze_Program(self, node: Program):
-        for decl in node.declarations:
-            self.analyze(decl)
+    def enter_Program(self, node: Program):
+        pass
 
-    def analyze_TriadDeclaration(self, node: TriadDeclaration):
+    def enter_TriadDeclaration(self, node: TriadDeclaration):
         self.symbol_table.define(node.name, node)
         # Example: create a Triad instance for the declaration
         triad_id = b"semantic_triad_id_" + node.name.encode()
@@ -50,30 +49,41 @@ class SemanticAnalyzer:
             # Could add field type checks here
             pass
 
-    def analyze_FunctionDeclaration(self, node: FunctionDeclaration):
+    def enter_FunctionDeclaration(self, node: FunctionDeclaration):
         self.symbol_table.define(node.name, node)
         for param in node.params:
             # Could add param type checks here
             pass
-        self.analyze(node.body)
 
-    def analyze_Block(self, node: Block):
-        for stmt in node.statements:
-            self.analyze(stmt)
+    def enter_Block(self, node: Block):
+        pass
+
+    def enter_ParallelBlock(self, node: ParallelBlock):
+        pass
 
-    def analyze_VariableDeclaration(self, node: VariableDeclaration):
+    def enter_VariableDeclaration(self, node: VariableDeclaration):
         self.symbol_table.define(node.name, node)
-        if node.initializer:
-            self.analyze(node.initializer)
 
-    def analyze_CallExpression(self, node: CallExpression):
+    def lookup(self, name: str, node: Expression) -> Any:
+        try:
+            return self.symbol_table.lookup(name)
+        except SemanticError as e:
+            if node.span is None:
+                raise
+            raise SemanticError(f"{e} at position {node.span[0]}") from None
+
+    def enter_CallExpression(self, node: CallExpression):
         # Check function exists
-        func = self.symbol_table.lookup(node.callee.name)
-        for arg in node.args:
-            self.analyze(arg)
+        func = self.lookup(node.callee.name, node)
+
+    def enter_BinaryExpression(self, node: BinaryExpression):
+        pass
+
+    def enter_UnaryExpression(self, node: UnaryExpression):
+        pass
 
-    def analyze_Identifier(self, node: Identifier):
-        self.symbol_table.lookup(node.name)
+    def enter_Identifier(self, node: Identifier):
+        self.lookup(node.name, node)
 
-    def analyze_Literal(self, node: Literal):
+    def enter_Literal(self, node: Literal):
         pass
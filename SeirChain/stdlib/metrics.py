@@ -0,0 +1,186 @@
+"""
+Instrumentation for the compiler and storage layers.
+
+Counters and histograms live in a MetricsRegistry, which renders them in the
+Prometheus text exposition format and can serve them over a local HTTP
+endpoint. `profiled` optionally wraps a block of work in cProfile and/or
+tracemalloc and writes the results to disk.
+"""
+
+import bisect
+import cProfile
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds, from 10us to 10s
+DEFAULT_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+SIZE_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 5000, 10000)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+def _escape_label_value(value: str) -> str:
+    # Backslash, double quote and newline must be escaped in the text format
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label_value(value)}"' for key, value in pairs) + "}"
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+        self.lock = threading.Lock()
+
+    def inc(self, amount: float = 1):
+        with self.lock:
+            self.value += amount
+
+    def samples(self, name: str, labels: Labels) -> List[str]:
+        return [f"{name}{_format_labels(labels)} {_format_value(self.value)}"]
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def samples(self, name: str, labels: Labels) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            lines.append(f"{name}_bucket{_format_labels(labels, ('le', _format_value(bound)))} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(self.sum)}")
+        lines.append(f"{name}_count{_format_labels(labels)} {self.count}")
+        return lines
+
+class MetricFamily:
+    def __init__(self, name: str, kind: str, help: str):
+        self.name = name
+        self.kind = kind
+        self.help = help
+        self.metrics: Dict[Labels, object] = {}
+
+class MetricsRegistry:
+    def __init__(self):
+        self.families: Dict[str, MetricFamily] = {}
+        self.lock = threading.Lock()
+
+    def _get(self, name: str, kind: str, help: str, labels: Dict[str, str], factory):
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        with self.lock:
+            family = self.families.get(name)
+            if family is None:
+                family = self.families[name] = MetricFamily(name, kind, help)
+            elif family.kind != kind:
+                raise ValueError(f"Metric '{name}' already registered as a {family.kind}")
+            metric = family.metrics.get(key)
+            if metric is None:
+                metric = family.metrics[key] = factory()
+            return metric
+
+    def counter(self, name: str, help: str = "", **labels: str) -> Counter:
+        return self._get(name, "counter", help, labels, Counter)
+
+    def histogram(self, name: str, help: str = "", buckets: Sequence[float] = DEFAULT_BUCKETS,
+                  **labels: str) -> Histogram:
+        return self._get(name, "histogram", help, labels, lambda: Histogram(buckets))
+
+    def timer(self, name: str, help: str = "", **labels: str):
+        return self.histogram(name, help, **labels).time()
+
+    def render(self) -> str:
+        lines = []
+        with self.lock:
+            families = list(self.families.values())
+        for family in families:
+            if family.help:
+                lines.append(f"# HELP {family.name} {family.help}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            for labels, metric in list(family.metrics.items()):
+                lines.extend(metric.samples(family.name, labels))
+        return "\n".join(lines) + "\n"
+
+REGISTRY = MetricsRegistry()
+
+class MetricsServer:
+    """Serves a registry in Prometheus text format on http://<host>:<port>/metrics."""
+
+    def __init__(self, registry: MetricsRegistry = REGISTRY, port: int = 9464, host: str = "127.0.0.1"):
+        registry_ref = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry_ref.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def port(self) -> int:
+        return self.httpd.server_address[1]
+
+    def start(self) -> "MetricsServer":
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+@contextmanager
+def profiled(cprofile_path: Optional[str] = None, tracemalloc_path: Optional[str] = None) -> Iterator[None]:
+    """Optionally record a cProfile (.prof) and/or tracemalloc snapshot of the enclosed block."""
+    profiler = cProfile.Profile() if cprofile_path else None
+    if tracemalloc_path:
+        tracemalloc.start()
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(cprofile_path)
+        if tracemalloc_path:
+            tracemalloc.take_snapshot().dump(tracemalloc_path)
+            tracemalloc.stop()
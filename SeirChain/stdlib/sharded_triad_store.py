@@ -0,0 +1,207 @@
+import asyncio
+import logging
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from SeirChain.stdlib.triad_matrix import Triad
+from SeirChain.stdlib.fractal_coordinate import FractalCoordinate
+from SeirChain.stdlib.triad_store import TriadStore, StorageError
+from SeirChain.stdlib.metrics import MetricsRegistry, REGISTRY
+
+CoordPrefix = Tuple[int, ...]
+
+# Triads decoded per executor call while a rebalance scans its source shard
+REBALANCE_CHUNK = 1024
+
+def _coord_str(path: Iterable[int]) -> str:
+    return ''.join(str(d) for d in path)
+
+def _has_prefix(path: Optional[Sequence[int]], prefix: CoordPrefix) -> bool:
+    if not path:
+        return not prefix
+    return tuple(path[:len(prefix)]) == prefix
+
+def _subtree_chunks(store: TriadStore, prefix: CoordPrefix) -> Iterator[List[Triad]]:
+    chunk = []
+    for triad in store.iter_triads():
+        if _has_prefix(triad.coordinate, prefix):
+            chunk.append(triad)
+            if len(chunk) == REBALANCE_CHUNK:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+class ShardRouter:
+    """Maps coordinate-prefix subtrees of the Triad Matrix to shards.
+
+    A triad belongs to the shard registered under the longest prefix of its
+    ternary coordinate. The empty prefix is the root shard and owns every
+    subtree that has not been carved out.
+    """
+
+    def __init__(self):
+        self.shards: Dict[CoordPrefix, TriadStore] = {}
+
+    def add(self, prefix: CoordPrefix, store: TriadStore):
+        self.shards[prefix] = store
+
+    def remove(self, prefix: CoordPrefix) -> TriadStore:
+        return self.shards.pop(prefix)
+
+    def route(self, path: Optional[Sequence[int]]) -> Tuple[CoordPrefix, TriadStore]:
+        path = tuple(path) if path else ()
+        for length in range(len(path), -1, -1):
+            prefix = path[:length]
+            store = self.shards.get(prefix)
+            if store is not None:
+                return prefix, store
+        raise StorageError("No root shard configured")
+
+    def overlapping(self, from_path: Sequence[int], to_path: Sequence[int]) -> List[TriadStore]:
+        # A subtree rooted at P holds coordinates from P up to P222..., so it
+        # can only intersect [from, to] when P <= to and from[:len(P)] <= P.
+        from_str = _coord_str(from_path)
+        to_str = _coord_str(to_path)
+        result = []
+        for prefix, store in self.shards.items():
+            prefix_str = _coord_str(prefix)
+            if not prefix or (prefix_str <= to_str and from_str[:len(prefix_str)] <= prefix_str):
+                result.append(store)
+        return result
+
+class ShardedTriadStore:
+    """Triad-based state sharding over one TriadStore (RocksDB instance) per subtree.
+
+    Each shard has its own database directory and lock, and TriadStore runs
+    its RocksDB calls in the default executor, so operations fanned out with
+    asyncio.gather proceed on all shards at once and shards can live on
+    separate disks.
+    """
+
+    def __init__(self, db_root: str, shard_prefixes: Iterable[Sequence[int]] = (), metrics: MetricsRegistry = REGISTRY):
+        self.db_root = db_root
+        self.metrics = metrics
+        self.router = ShardRouter()
+        self.logger = logging.getLogger("ShardedTriadStore")
+        # Subtrees being rebalanced: prefix -> destination store receiving dual writes
+        self.migrating: Dict[CoordPrefix, TriadStore] = {}
+        # Ids deleted from a migrating subtree, which the copy must not bring back
+        self.tombstones: Dict[CoordPrefix, Set[bytes]] = {}
+        # Ids mirrored into a migrating subtree, which the source drops after cutover
+        self.mirrored: Dict[CoordPrefix, Set[bytes]] = {}
+        self.add_shard(())
+        for prefix in shard_prefixes:
+            self.add_shard(tuple(prefix))
+
+    def shard_path(self, prefix: CoordPrefix) -> str:
+        return os.path.join(self.db_root, f"shard_{_coord_str(prefix) or 'root'}")
+
+    def add_shard(self, prefix: CoordPrefix, db_path: Optional[str] = None) -> TriadStore:
+        if prefix in self.router.shards:
+            raise StorageError(f"Shard for prefix '{_coord_str(prefix)}' already exists")
+        store = TriadStore(db_path=db_path or self.shard_path(prefix), metrics=self.metrics)
+        self.router.add(prefix, store)
+        return store
+
+    def shard_for(self, coord: FractalCoordinate) -> TriadStore:
+        return self.router.route(coord.path)[1]
+
+    def _owns(self, store: TriadStore, triad: Triad) -> bool:
+        # After a cutover the source shard still holds stale copies of the moved
+        # subtree until cleanup finishes; only the routed shard's copy is current
+        return self.router.route(triad.coordinate)[1] is store
+
+    def _migration(self, path: Optional[Sequence[int]], routed: CoordPrefix) -> Optional[CoordPrefix]:
+        # Only mirror writes that are still served by the shard being split
+        for prefix in self.migrating:
+            if len(routed) < len(prefix) and _has_prefix(path, prefix):
+                return prefix
+        return None
+
+    async def put_triad(self, triad: Triad) -> None:
+        routed, store = self.router.route(triad.coordinate)
+        migration = self._migration(triad.coordinate, routed)
+        if migration is None:
+            await store.put_triad(triad)
+            return
+        self.tombstones[migration].discard(triad.id)
+        self.mirrored[migration].add(triad.id)
+        await asyncio.gather(store.put_triad(triad), self.migrating[migration].put_triad(triad))
+
+    async def get_triad(self, id: bytes, coord: Optional[FractalCoordinate] = None) -> Optional[Triad]:
+        if coord is not None:
+            return await self.shard_for(coord).get_triad(id)
+        # Without a coordinate hint every shard has to be asked
+        stores = list(self.router.shards.values())
+        results = await asyncio.gather(*(store.get_triad(id) for store in stores))
+        for store, triad in zip(stores, results):
+            if triad is not None and self._owns(store, triad):
+                return triad
+        return None
+
+    async def get_by_coordinate(self, coord: FractalCoordinate) -> List[Triad]:
+        return await self.shard_for(coord).get_by_coordinate(coord)
+
+    async def delete_triad(self, id: bytes, coord: Optional[FractalCoordinate] = None) -> bool:
+        if coord is not None:
+            routed, store = self.router.route(coord.path)
+            stores = [store]
+            migration = self._migration(coord.path, routed)
+            migrations = [migration] if migration is not None else []
+        else:
+            stores = list(self.router.shards.values())
+            migrations = list(self.migrating)
+        for prefix in migrations:
+            self.tombstones[prefix].add(id)
+            stores.append(self.migrating[prefix])
+        await asyncio.gather(*(store.delete_triad(id) for store in stores))
+        return True
+
+    async def range_query(self, from_coord: FractalCoordinate, to_coord: FractalCoordinate) -> List[Triad]:
+        stores = self.router.overlapping(from_coord.path, to_coord.path)
+        results = await asyncio.gather(*(store.range_query(from_coord, to_coord) for store in stores))
+        # A triad can briefly exist in two shards while its subtree is being moved
+        owned = [triad for store, triads in zip(stores, results) for triad in triads if self._owns(store, triad)]
+        return sorted(owned, key=lambda t: _coord_str(t.coordinate or ()))
+
+    async def rebalance(self, prefix: Sequence[int], db_path: Optional[str] = None) -> TriadStore:
+        """Move the subtree rooted at `prefix` into a new shard while serving traffic.
+
+        Writes and deletes in the subtree are mirrored to the new shard while
+        existing triads are copied from a snapshot of the source. The copy
+        never overwrites a triad the new shard already holds and skips
+        triads deleted since the migration began, so mirrored changes win
+        over stale snapshot data. Routing then switches over and the copied
+        and mirrored ids are deleted from the source shard. The scan runs in
+        chunks on the default executor, so the event loop keeps serving.
+        """
+        prefix = tuple(prefix)
+        if prefix in self.router.shards or prefix in self.migrating:
+            raise StorageError(f"Shard for prefix '{_coord_str(prefix)}' already exists")
+        _, source = self.router.route(prefix)
+        target = TriadStore(db_path=db_path or self.shard_path(prefix), metrics=self.metrics)
+        tombstones = self.tombstones[prefix] = set()
+        mirrored = self.mirrored[prefix] = set()
+        self.migrating[prefix] = target
+        scanned: Set[bytes] = set()
+        copied = 0
+        try:
+            chunks = _subtree_chunks(source, prefix)
+            while True:
+                chunk = await asyncio.to_thread(next, chunks, None)
+                if chunk is None:
+                    break
+                for triad in chunk:
+                    scanned.add(triad.id)
+                    copied += await target.put_if_absent(triad, tombstones)
+            self.router.add(prefix, target)
+        finally:
+            del self.migrating[prefix]
+            del self.tombstones[prefix]
+            del self.mirrored[prefix]
+        # Everything under `prefix` in the source was either in the scan or written since
+        stale = scanned | mirrored
+        await asyncio.gather(*(source.delete_triad(triad_id) for triad_id in stale))
+        self.logger.info(f"Rebalanced {copied} triads under prefix '{_coord_str(prefix)}' to {target.db_path}, "
+                         f"removed {len(stale)} from {source.db_path}")
+        return target
@@ -0,0 +1,243 @@
+"""
+Bulk export and import of Triad Matrix snapshots.
+
+A snapshot is a single flat file:
+
+    header   magic, version, coordinate key width, record count, section offsets
+    records  length-prefixed (triad id, compressed triad) records, sorted by coordinate
+    index    one fixed-size (coordinate key, record offset) entry per record
+
+Coordinate keys store each ternary digit as digit + 1 and are zero padded to
+the key width, so byte order equals coordinate order and a coordinate range
+maps to a contiguous slice of the index. Records keep the exact bytes stored
+in RocksDB, so neither side recompresses anything.
+
+The importer memory-maps the file and writes the requested coordinate
+range straight from the mapping in large write batches that skip the
+write-ahead log, then compacts the database so the data is durable.
+The python-rocksdb binding (pinned in requirements.txt) exposes neither
+SstFileWriter nor external file ingestion, so SST ingestion is not an option.
+"""
+
+import asyncio
+import heapq
+import logging
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from typing import BinaryIO, Iterator, List, Optional, Sequence, Tuple
+import rocksdb
+from SeirChain.stdlib.triad_matrix import Triad
+from SeirChain.stdlib.triad_store import TriadStore, StorageError
+
+MAGIC = b"TRIADSNP"
+VERSION = 1
+# magic, version, coordinate key width, record count, records offset, index offset
+HEADER = struct.Struct("<8sHHQQQ")
+# id length, value length
+RECORD_HEADER = struct.Struct("<HI")
+OFFSET = struct.Struct("<Q")
+# Coordinate key length in run files; one byte per ternary digit
+KEY_LENGTH = struct.Struct("<H")
+# Entries buffered in memory per sorted run during export
+DEFAULT_CHUNK_SIZE = 1_000_000
+# Records per write batch during import
+DEFAULT_BATCH_SIZE = 50_000
+
+logger = logging.getLogger("TriadSnapshot")
+
+def coordinate_key(path: Sequence[int]) -> bytes:
+    return bytes(d + 1 for d in path)
+
+def coordinate_path(key: bytes) -> Tuple[int, ...]:
+    return tuple(b - 1 for b in key.rstrip(b"\0"))
+
+def _write_run_entry(f: BinaryIO, key: bytes, triad_id: bytes, value: bytes):
+    f.write(KEY_LENGTH.pack(len(key)))
+    f.write(key)
+    f.write(RECORD_HEADER.pack(len(triad_id), len(value)))
+    f.write(triad_id)
+    f.write(value)
+
+def _read_run(path: str) -> Iterator[Tuple[bytes, bytes, bytes]]:
+    with open(path, "rb") as f:
+        while True:
+            key_len = f.read(KEY_LENGTH.size)
+            if not key_len:
+                return
+            key = f.read(KEY_LENGTH.unpack(key_len)[0])
+            id_len, value_len = RECORD_HEADER.unpack(f.read(RECORD_HEADER.size))
+            yield key, f.read(id_len), f.read(value_len)
+
+def export_snapshot(path: str, *stores: TriadStore, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Write every triad of `stores` (e.g. all shards of a ShardedTriadStore) to a snapshot file.
+
+    Entries are sorted with an external merge sort, so memory use is bounded
+    by `chunk_size` regardless of the number of triads. Returns the record count.
+    """
+    work_dir = tempfile.mkdtemp(prefix="triad_snapshot_", dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        runs: List[str] = []
+        chunk: List[Tuple[bytes, bytes, bytes]] = []
+        width = 0
+
+        def flush():
+            chunk.sort()
+            run_path = os.path.join(work_dir, f"run_{len(runs)}")
+            with open(run_path, "wb") as f:
+                for entry in chunk:
+                    _write_run_entry(f, *entry)
+            runs.append(run_path)
+            chunk.clear()
+
+        for store in stores:
+            for triad_id, value in store.iter_items():
+                triad = Triad.deserialize(store.compression_engine.decompress(value))
+                key = coordinate_key(triad.coordinate or ())
+                if len(key) > 0xFFFF:
+                    raise StorageError(f"Coordinate of triad {triad_id.hex()} is deeper than a snapshot can hold")
+                width = max(width, len(key))
+                chunk.append((key, triad_id, value))
+                if len(chunk) >= chunk_size:
+                    flush()
+        if runs and chunk:
+            flush()
+        entries = heapq.merge(*(_read_run(run) for run in runs)) if runs else iter(sorted(chunk))
+
+        count = 0
+        index_path = os.path.join(work_dir, "index")
+        with open(path, "wb") as out, open(index_path, "wb") as index:
+            out.write(b"\0" * HEADER.size)
+            for key, triad_id, value in entries:
+                index.write(key.ljust(width, b"\0"))
+                index.write(OFFSET.pack(out.tell()))
+                out.write(RECORD_HEADER.pack(len(triad_id), len(value)))
+                out.write(triad_id)
+                out.write(value)
+                count += 1
+            index_offset = out.tell()
+            # The index is still open for writing, so flush it before reading it back
+            index.flush()
+            with open(index_path, "rb") as f:
+                shutil.copyfileobj(f, out)
+            out.seek(0)
+            out.write(HEADER.pack(MAGIC, VERSION, width, count, HEADER.size, index_offset))
+        logger.info(f"Exported {count} triads to {path}")
+        return count
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+class SnapshotReader:
+    """Random access to a memory-mapped snapshot file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.width, self.count, self.records_offset, self.index_offset = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise StorageError(f"{path} is not a version {VERSION} triad snapshot")
+        self.entry_size = self.width + OFFSET.size
+
+    def __enter__(self) -> "SnapshotReader":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, i: int) -> bytes:
+        # Coordinate key of record i, so the reader can be bisected directly
+        start = self.index_offset + i * self.entry_size
+        return self.map[start:start + self.width]
+
+    def record_offset(self, i: int) -> int:
+        return OFFSET.unpack_from(self.map, self.index_offset + i * self.entry_size + self.width)[0]
+
+    def record(self, i: int) -> Tuple[bytes, bytes]:
+        offset = self.record_offset(i)
+        id_len, value_len = RECORD_HEADER.unpack_from(self.map, offset)
+        start = offset + RECORD_HEADER.size
+        return self.map[start:start + id_len], self.map[start + id_len:start + id_len + value_len]
+
+    def triad_id(self, i: int) -> bytes:
+        offset = self.record_offset(i)
+        id_len, _ = RECORD_HEADER.unpack_from(self.map, offset)
+        return self.map[offset + RECORD_HEADER.size:offset + RECORD_HEADER.size + id_len]
+
+    def coordinate_range(self, from_path: Optional[Sequence[int]] = None,
+                         to_path: Optional[Sequence[int]] = None) -> Tuple[int, int]:
+        """Record indices [start, end) from from_path up to and including the subtree under to_path."""
+        start = 0
+        end = self.count
+        if from_path is not None:
+            key = coordinate_key(from_path)
+            if len(key) > self.width:
+                # Deeper than any record: records equal to the truncated key sort before it
+                start = _bisect_right(self, key[:self.width], 0, end)
+            else:
+                start = _bisect_left(self, key.ljust(self.width, b"\0"), 0, end)
+        if to_path is not None:
+            # Every coordinate in the subtree under to_path sorts below its key padded with 0xff
+            upper = coordinate_key(to_path)[:self.width].ljust(self.width, b"\xff")
+            end = _bisect_right(self, upper, start, end)
+        return start, end
+
+def _bisect_left(reader: SnapshotReader, key: bytes, lo: int, hi: int) -> int:
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if reader[mid] < key:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+def _bisect_right(reader: SnapshotReader, key: bytes, lo: int, hi: int) -> int:
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if key < reader[mid]:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+def _write_range(store: TriadStore, reader: SnapshotReader, start: int, end: int, batch_size: int):
+    # Runs on an executor thread: batches skip the write-ahead log, and the
+    # final compaction flushes the memtable so the import is durable
+    for lo in range(start, end, batch_size):
+        batch = rocksdb.WriteBatch()
+        for i in range(lo, min(lo + batch_size, end)):
+            batch.put(*reader.record(i))
+        store.db.write(batch, disable_wal=True)
+    store.db.compact_range()
+
+async def import_snapshot(path: str, store: TriadStore, from_path: Optional[Sequence[int]] = None,
+                          to_path: Optional[Sequence[int]] = None, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Load a snapshot (or one coordinate range of it) into `store`.
+
+    Records are written in large write batches without the write-ahead log
+    and then compacted, all under the store lock. The coordinate index is
+    rebuilt from the snapshot's offset table, so no triad is decompressed.
+    Returns the number of triads imported.
+    """
+    with SnapshotReader(path) as reader:
+        start, end = reader.coordinate_range(from_path, to_path)
+        if start == end:
+            return 0
+        async with store.locked():
+            await asyncio.to_thread(_write_range, store, reader, start, end, batch_size)
+            for i in range(start, end):
+                coord_str = ''.join(str(d) for d in coordinate_path(reader[i]))
+                if coord_str:
+                    store.index_manager.coord_index[coord_str] = reader.triad_id(i)
+    logger.info(f"Imported {end - start} triads from {path} into {store.db_path}")
+    return end - start
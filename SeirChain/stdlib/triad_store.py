@@ -1,9 +1,12 @@
 import asyncio
 import rocksdb
 import logging
-from typing import Optional, List, Any
+import time
+from contextlib import asynccontextmanager
+from typing import Optional, List, Any, Collection, Iterator, Tuple
 from SeirChain.stdlib.triad_matrix import Triad
 from SeirChain.stdlib.fractal_coordinate import FractalCoordinate
+from SeirChain.stdlib.metrics import Histogram, MetricsRegistry, REGISTRY, SIZE_BUCKETS
 
 class StorageError(Exception):
     pass
@@ -17,11 +20,18 @@ import logging
 from typing import Dict
 
 class CompressionEngine:
+    def __init__(self, metrics: MetricsRegistry = REGISTRY, **labels: str):
+        self.compress_time = metrics.histogram("triad_store_compress_seconds", "Time spent compressing triads", **labels)
+        self.decompress_time = metrics.histogram("triad_store_decompress_seconds", "Time spent decompressing triads",
+                                                 **labels)
+
     def compress(self, data: bytes) -> bytes:
-        return zlib.compress(data)
+        with self.compress_time.time():
+            return zlib.compress(data)
 
     def decompress(self, data: bytes) -> bytes:
-        return zlib.decompress(data)
+        with self.decompress_time.time():
+            return zlib.decompress(data)
 
 class IndexManager:
     def __init__(self):
@@ -33,17 +43,12 @@ class IndexManager:
         if coord_str:
             self.coord_index[coord_str] = triad.id
 
-    def query_range(self, from_coord: FractalCoordinate, to_coord: FractalCoordinate) -> List[Triad]:
-        # For simplicity, return triads whose coordinate strings are lexicographically between from and to
+    def query_range(self, from_coord: FractalCoordinate, to_coord: FractalCoordinate) -> List[bytes]:
+        # Ids of triads whose coordinate strings are lexicographically between from and to
         from_str = ''.join(str(d) for d in from_coord.path)
         to_str = ''.join(str(d) for d in to_coord.path)
-        result = []
-        for coord_str, triad_id in self.coord_index.items():
-            if from_str <= coord_str <= to_str:
-                # In real implementation, fetch triad by id from storage
-                # Here, just return empty list as placeholder
-                pass
-        return result
+        return [triad_id for coord_str, triad_id in sorted(self.coord_index.items())
+                if from_str <= coord_str <= to_str]
 
 class ReplicationManager:
     def __init__(self):
@@ -67,22 +72,66 @@ class IntegrityChecker:
         return is_valid
 
 class TriadStore:
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, metrics: MetricsRegistry = REGISTRY):
         self.db_path = db_path
         self.db = rocksdb.DB(db_path, rocksdb.Options(create_if_missing=True))
         self.index_manager = IndexManager()
         self.replication_manager = ReplicationManager()
-        self.compression_engine = CompressionEngine()
+        # Every series is labelled with the database path, so shards stay distinguishable
+        labels = {"db_path": db_path}
+        self.compression_engine = CompressionEngine(metrics, **labels)
         self.integrity_checker = IntegrityChecker()
         self.logger = logging.getLogger("TriadStore")
         self.lock = asyncio.Lock()
+        self.put_latency = metrics.histogram("triad_store_put_seconds", "Latency of TriadStore.put_triad", **labels)
+        self.get_latency = metrics.histogram("triad_store_get_seconds", "Latency of TriadStore.get_triad", **labels)
+        self.lock_wait = metrics.histogram("triad_store_lock_wait_seconds", "Time spent waiting for the store lock",
+                                           **labels)
+        self.batch_latency = metrics.histogram("triad_store_put_batch_seconds", "Latency of TriadStore.put_triads",
+                                               **labels)
+        self.batch_size = metrics.histogram("triad_store_batch_size", "Triads per write batch", SIZE_BUCKETS, **labels)
+        self.get_hits = metrics.counter("triad_store_get_total", "TriadStore.get_triad lookups", result="hit", **labels)
+        self.get_misses = metrics.counter("triad_store_get_total", "TriadStore.get_triad lookups", result="miss",
+                                          **labels)
+
+    @asynccontextmanager
+    async def locked(self, latency: Optional[Histogram] = None):
+        # Records the lock wait and, if given, the latency of the whole operation
+        start = time.perf_counter()
+        async with self.lock:
+            self.lock_wait.observe(time.perf_counter() - start)
+            try:
+                yield
+            finally:
+                if latency is not None:
+                    latency.observe(time.perf_counter() - start)
+
+    # RocksDB calls and (de)compression block, so they run in the default
+    # executor; the event loop stays free and separate stores work in parallel
+
+    def _write(self, triad: Triad):
+        self.db.put(triad.id, self.compression_engine.compress(triad.serialize()))
+
+    def _write_batch(self, triads: List[Triad]):
+        batch = rocksdb.WriteBatch()
+        for triad in triads:
+            batch.put(triad.id, self.compression_engine.compress(triad.serialize()))
+        self.db.write(batch)
+
+    def _read(self, id: bytes) -> Optional[Triad]:
+        compressed = self.db.get(id)
+        if compressed is None:
+            return None
+        return Triad.deserialize(self.compression_engine.decompress(compressed))
+
+    def _read_many(self, ids: List[bytes]) -> List[Triad]:
+        triads = (self._read(id) for id in ids)
+        return [triad for triad in triads if triad is not None and self.integrity_checker.verify(triad)]
 
     async def put_triad(self, triad: Triad) -> None:
-        async with self.lock:
+        async with self.locked(self.put_latency):
             try:
-                data = triad.serialize()
-                compressed = self.compression_engine.compress(data)
-                self.db.put(triad.id, compressed)
+                await asyncio.to_thread(self._write, triad)
                 self.index_manager.index_triad(triad)
                 await self.replication_manager.replicate(triad)
                 self.logger.info(f"Triad {triad.id.hex()} stored successfully.")
@@ -90,14 +139,28 @@ class TriadStore:
                 self.logger.error(f"Error storing triad {triad.id.hex()}: {e}")
                 raise StorageError(str(e))
 
+    async def put_triads(self, triads: List[Triad]) -> None:
+        # Write many triads atomically with a single RocksDB write batch
+        async with self.locked(self.batch_latency):
+            try:
+                await asyncio.to_thread(self._write_batch, triads)
+                self.batch_size.observe(len(triads))
+                for triad in triads:
+                    self.index_manager.index_triad(triad)
+                    await self.replication_manager.replicate(triad)
+                self.logger.info(f"{len(triads)} triads stored successfully.")
+            except Exception as e:
+                self.logger.error(f"Error storing batch of {len(triads)} triads: {e}")
+                raise StorageError(str(e))
+
     async def get_triad(self, id: bytes) -> Optional[Triad]:
-        async with self.lock:
+        async with self.locked(self.get_latency):
             try:
-                compressed = self.db.get(id)
-                if compressed is None:
+                triad = await asyncio.to_thread(self._read, id)
+                if triad is None:
+                    self.get_misses.inc()
                     return None
-                data = self.compression_engine.decompress(compressed)
-                triad = Triad.deserialize(data)
+                self.get_hits.inc()
                 if not self.integrity_checker.verify(triad):
                     self.logger.warning(f"Integrity check failed for triad {id.hex()}")
                     return None
@@ -106,14 +169,42 @@ class TriadStore:
                 self.logger.error(f"Error retrieving triad {id.hex()}: {e}")
                 raise StorageError(str(e))
 
+    async def put_if_absent(self, triad: Triad, excluded: Collection[bytes] = ()) -> bool:
+        """Store `triad` unless its id is already stored or in `excluded`.
+
+        The check and the write happen under the store lock, so a concurrent
+        put_triad or delete_triad is never overwritten. Returns whether the
+        triad was written.
+        """
+        async with self.locked(self.put_latency):
+            try:
+                if triad.id in excluded or await asyncio.to_thread(self.db.get, triad.id) is not None:
+                    return False
+                await asyncio.to_thread(self._write, triad)
+                self.index_manager.index_triad(triad)
+                return True
+            except Exception as e:
+                self.logger.error(f"Error storing triad {triad.id.hex()}: {e}")
+                raise StorageError(str(e))
+
+    def iter_items(self) -> Iterator[Tuple[bytes, bytes]]:
+        # Full scan of (triad id, compressed triad) pairs, used for rebalancing and export
+        it = self.db.iteritems()
+        it.seek_to_first()
+        yield from it
+
+    def iter_triads(self) -> Iterator[Triad]:
+        for _, compressed in self.iter_items():
+            data = self.compression_engine.decompress(compressed)
+            yield Triad.deserialize(data)
+
     async def get_by_coordinate(self, coord: FractalCoordinate) -> List[Triad]:
-        # Placeholder: query index manager for triads by coordinate
-        return self.index_manager.query_range(coord, coord)
+        return await self.range_query(coord, coord)
 
     async def delete_triad(self, id: bytes) -> bool:
-        async with self.lock:
+        async with self.locked():
             try:
-                self.db.delete(id)
+                await asyncio.to_thread(self.db.delete, id)
                 self.logger.info(f"Triad {id.hex()} deleted successfully.")
                 return True
             except Exception as e:
@@ -121,8 +212,14 @@ class TriadStore:
                 raise StorageError(str(e))
 
     async def range_query(self, from_coord: FractalCoordinate, to_coord: FractalCoordinate) -> List[Triad]:
-        # Placeholder: query index manager for triads in range
-        return self.index_manager.query_range(from_coord, to_coord)
+        # Coordinate index -> ids -> stored triads; ids whose triad was deleted are skipped
+        async with self.locked():
+            ids = self.index_manager.query_range(from_coord, to_coord)
+            try:
+                return await asyncio.to_thread(self._read_many, ids)
+            except Exception as e:
+                self.logger.error(f"Error reading coordinate range: {e}")
+                raise StorageError(str(e))
 
     async def backup_snapshot(self) -> BackupId:
         # Placeholder for snapshot backup logic
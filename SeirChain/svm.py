@@ -0,0 +1,411 @@
+"""
+SeirChain Virtual Machine (SVM): bytecode compiler and parallel executor for .cry programs.
+
+`parallel` blocks and recursion branches of `fractal` functions are scheduled
+across a worker pool. Every task runs optimistically against a snapshot and
+records the keys it reads and writes; tasks are then validated in their preset
+order. Committing a task invalidates every later speculative execution that
+read one of the keys it wrote (in the spirit of Block-STM); only those are
+re-executed, so the final state always equals serial execution.
+
+Only the outermost level of parallelism fans out: the transactions of
+`execute_block`, or the parallel sections of a single `invoke`. Code that is
+already running on a worker (a `parallel` block inside a block transaction,
+or fractal recursion below the first level) runs its branches in order on
+that worker, since blocking a worker on the pool could deadlock it. Workers
+are threads, so under CPython's GIL speculation only pays off when
+contracts spend their time in builtins that release the lock; pure Python
+contracts run fastest sequentially. That is the default (`workers=1`, no
+pool); pass `workers > 1` to opt into speculation.
+"""
+
+import operator
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum, auto
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+from ast import *
+from visitor import NodeVisitor, walk
+
+class SVMError(Exception):
+    pass
+
+class OpCode(Enum):
+    LOAD_CONST = auto()
+    LOAD_NAME = auto()
+    STORE_NAME = auto()
+    CALL = auto()
+    POP = auto()
+    PARALLEL = auto()
+    BINARY_OP = auto()
+    UNARY_OP = auto()
+    JUMP_IF_FALSE_OR_POP = auto()
+    JUMP_IF_TRUE_OR_POP = auto()
+
+# .cry numbers are integers, so `/` is integer division
+BINARY_OPERATORS: Dict[str, Callable[[Any, Any], Any]] = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.floordiv,
+    "%": operator.mod,
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+UNARY_OPERATORS: Dict[str, Callable[[Any], Any]] = {
+    "-": operator.neg,
+    "!": operator.not_,
+}
+
+# Short-circuiting operators compile to conditional jumps over the right operand
+SHORT_CIRCUIT_OPERATORS = {
+    "&&": OpCode.JUMP_IF_FALSE_OR_POP,
+    "||": OpCode.JUMP_IF_TRUE_OR_POP,
+}
+
+Instruction = Tuple[OpCode, Any]
+
+class CodeObject:
+    def __init__(self, name: str, params: List[str], instructions: List[Instruction], is_fractal: bool = False):
+        self.name = name
+        self.params = params
+        self.instructions = instructions
+        self.is_fractal = is_fractal
+
+class BytecodeCompiler(NodeVisitor):
+    """Lowers function bodies to SVM instructions in a single iterative walk.
+
+    Every leave hook returns the instruction list for its node: expressions
+    the code that pushes their value, statements the code that runs them, and
+    blocks one list per statement so parallel branches can be split out.
+    Jump arguments are relative to the next instruction, so fragments can be
+    concatenated without patching.
+    """
+
+    def __init__(self):
+        self.fractal_functions: Set[str] = set()
+
+    def compile_program(self, node: Program) -> Dict[str, CodeObject]:
+        functions = [decl for decl in node.declarations if isinstance(decl, FunctionDeclaration)]
+        self.fractal_functions = {func.name for func in functions if func.is_fractal}
+        return {func.name: self.compile_function(func) for func in functions}
+
+    def compile_function(self, node: FunctionDeclaration) -> CodeObject:
+        return walk(node, self)[0]
+
+    def generic_visit(self, node: Node):
+        raise SVMError(f"Cannot compile {type(node).__name__}")
+
+    def leave_FunctionDeclaration(self, node: FunctionDeclaration, values) -> CodeObject:
+        statements = values[0]
+        if node.is_fractal:
+            statements = self.group_fractal_branches(node.body.statements, statements)
+        code = [instruction for statement in statements for instruction in statement]
+        return CodeObject(node.name, [param.name for param in node.params], code, node.is_fractal)
+
+    def group_fractal_branches(self, nodes: List[Node], statements: List[List[Instruction]]) -> List[List[Instruction]]:
+        # Consecutive calls to fractal functions are independent recursion
+        # branches, so they are scheduled like an implicit parallel block
+        grouped: List[List[Instruction]] = []
+        run: List[List[Instruction]] = []
+        for node, statement in list(zip(nodes, statements)) + [(None, None)]:
+            if isinstance(node, CallExpression) and node.callee.name in self.fractal_functions:
+                run.append(statement)
+                continue
+            if len(run) > 1:
+                grouped.append([self.parallel(run)])
+            else:
+                grouped.extend(run)
+            run = []
+            if statement is not None:
+                grouped.append(statement)
+        return grouped
+
+    @staticmethod
+    def parallel(branches: List[List[Instruction]]) -> Instruction:
+        return (OpCode.PARALLEL, [CodeObject(f"<parallel branch {i}>", [], branch) for i, branch in enumerate(branches)])
+
+    def leave_Block(self, node: Block, values) -> List[List[Instruction]]:
+        for stmt, code in zip(node.statements, values):
+            if isinstance(stmt, Expression):
+                # Expression statements discard their value
+                code.append((OpCode.POP, None))
+        return values
+
+    def leave_ParallelBlock(self, node: ParallelBlock, values) -> List[Instruction]:
+        return [self.parallel(values[0])]
+
+    def leave_VariableDeclaration(self, node: VariableDeclaration, values) -> List[Instruction]:
+        code = values[0] if node.initializer else [(OpCode.LOAD_CONST, None)]
+        code.append((OpCode.STORE_NAME, node.name))
+        return code
+
+    def leave_Literal(self, node: Literal, values) -> List[Instruction]:
+        return [(OpCode.LOAD_CONST, node.value)]
+
+    def leave_Identifier(self, node: Identifier, values) -> List[Instruction]:
+        return [(OpCode.LOAD_NAME, node.name)]
+
+    def leave_CallExpression(self, node: CallExpression, values) -> List[Instruction]:
+        code = [instruction for argument in values for instruction in argument]
+        code.append((OpCode.CALL, (node.callee.name, len(values))))
+        return code
+
+    def leave_BinaryExpression(self, node: BinaryExpression, values) -> List[Instruction]:
+        # Extend the left operand in place: left-associative chains stay linear
+        code, right = values
+        jump = SHORT_CIRCUIT_OPERATORS.get(node.operator)
+        if jump is not None:
+            code.append((jump, len(right)))
+            code.extend(right)
+        else:
+            code.extend(right)
+            code.append((OpCode.BINARY_OP, BINARY_OPERATORS[node.operator]))
+        return code
+
+    def leave_UnaryExpression(self, node: UnaryExpression, values) -> List[Instruction]:
+        code = values[0]
+        code.append((OpCode.UNARY_OP, UNARY_OPERATORS[node.operator]))
+        return code
+
+class GlobalState:
+    """Committed contract state shared by all transactions of a block."""
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        self.data: Dict[str, Any] = dict(data or {})
+
+    def read(self, key: str) -> Any:
+        return self.data.get(key)
+
+    def commit(self, writes: Dict[str, Any]):
+        self.data.update(writes)
+
+class StateView:
+    """Buffered reads and writes of one speculative task over a parent view."""
+
+    def __init__(self, parent):
+        self.parent = parent
+        self.reads: Set[str] = set()
+        self.writes: Dict[str, Any] = {}
+
+    def read(self, key: str) -> Any:
+        if key in self.writes:
+            return self.writes[key]
+        self.reads.add(key)
+        return self.parent.read(key)
+
+    def write(self, key: str, value: Any):
+        self.writes[key] = value
+
+    def commit(self, writes: Dict[str, Any]):
+        self.writes.update(writes)
+
+class TxResult:
+    def __init__(self, success: bool, value: Any = None, error: Optional[str] = None):
+        self.success = success
+        self.value = value
+        self.error = error
+
+class ExecutionStats:
+    def __init__(self):
+        self.rounds = 0
+        self.executions = 0
+        self.aborts = 0
+
+def _balance_key(account: Any) -> str:
+    return f"balance:{account}"
+
+def builtin_balance(view: StateView, account):
+    return view.read(_balance_key(account)) or 0
+
+def builtin_mint(view: StateView, account, amount):
+    view.write(_balance_key(account), builtin_balance(view, account) + amount)
+    return True
+
+def builtin_transfer(view: StateView, src, dst, amount):
+    src_balance = builtin_balance(view, src)
+    if amount < 0 or src_balance < amount:
+        return False
+    view.write(_balance_key(src), src_balance - amount)
+    view.write(_balance_key(dst), builtin_balance(view, dst) + amount)
+    return True
+
+def builtin_load(view: StateView, key):
+    return view.read(str(key))
+
+def builtin_store(view: StateView, key, value):
+    view.write(str(key), value)
+    return value
+
+BUILTINS: Dict[str, Callable[..., Any]] = {
+    "balance": builtin_balance,
+    "mint": builtin_mint,
+    "transfer": builtin_transfer,
+    "load": builtin_load,
+    "store": builtin_store,
+}
+
+class SVM:
+    def __init__(self, program: Program, state: Optional[Dict[str, Any]] = None,
+                 workers: int = 1, window: Optional[int] = None, max_depth: int = 64):
+        self.functions = BytecodeCompiler().compile_program(program)
+        self.state = GlobalState(state)
+        self.workers = workers
+        # Tasks validated per round; bounds the work lost when a conflict forces re-execution
+        self.window = window or workers * 4
+        self.max_depth = max_depth
+        self.pool = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+        self.stats = ExecutionStats()
+        self.local = threading.local()
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+
+    def invoke(self, name: str, args: Sequence[Any] = ()) -> Any:
+        """Run a single call, fanning its parallel sections out to the pool, and commit it."""
+        view = StateView(self.state)
+        value = self.call(name, list(args), view, 0)
+        self.state.commit(view.writes)
+        return value
+
+    def execute_block(self, transactions: Sequence[Tuple[str, Sequence[Any]]]) -> List[TxResult]:
+        """Execute a block of (function, args) transactions in parallel with serial-equivalent results."""
+        def run_tx(name, args):
+            return lambda view: self.call(name, list(args), view, 0)
+        tasks = [run_tx(name, args) for name, args in transactions]
+        results = []
+        for ok, value in self.schedule(tasks, self.state):
+            if ok:
+                results.append(TxResult(True, value))
+            else:
+                results.append(TxResult(False, error=str(value)))
+        return results
+
+    def schedule(self, tasks: List[Callable[[StateView], Any]], parent) -> List[Tuple[bool, Any]]:
+        if self.pool is None:
+            return self.schedule_sequential(tasks, parent)
+        results: List[Tuple[bool, Any]] = [(False, None)] * len(tasks)
+        pending = list(range(len(tasks)))
+        # Speculative executions whose read sets are still consistent with `parent`
+        speculative: Dict[int, Tuple[StateView, Tuple[bool, Any]]] = {}
+        while pending:
+            batch, pending = pending[:self.window], pending[self.window:]
+            stale = [index for index in batch if index not in speculative]
+            views = [StateView(parent) for _ in stale]
+            outcomes = self.pool.map(self.run_task, [tasks[index] for index in stale], views)
+            for index, view, outcome in zip(stale, views, outcomes):
+                speculative[index] = (view, outcome)
+            self.stats.rounds += 1
+            self.stats.executions += len(stale)
+            retry: List[int] = []
+            for index in batch:
+                # Commit in preset order up to the first task invalidated by an earlier commit
+                if retry or index not in speculative:
+                    retry.append(index)
+                    continue
+                view, outcome = speculative.pop(index)
+                ok, _ = outcome
+                if ok and view.writes:
+                    parent.commit(view.writes)
+                    for other in [i for i, (v, _) in speculative.items() if not v.reads.isdisjoint(view.writes)]:
+                        del speculative[other]
+                        self.stats.aborts += 1
+                results[index] = outcome
+            pending = retry + pending
+        return results
+
+    def schedule_sequential(self, tasks: List[Callable[[StateView], Any]], parent) -> List[Tuple[bool, Any]]:
+        # Nothing to overlap with, so skip speculation and commit each task as it finishes
+        results = []
+        for task in tasks:
+            view = StateView(parent)
+            outcome = self.run_task(task, view)
+            if outcome[0] and view.writes:
+                parent.commit(view.writes)
+            results.append(outcome)
+        self.stats.rounds += 1
+        self.stats.executions += len(tasks)
+        return results
+
+    def run_task(self, task: Callable[[StateView], Any], view: StateView) -> Tuple[bool, Any]:
+        self.local.in_worker = True
+        try:
+            return True, task(view)
+        except Exception as e:
+            # A failing transaction is reverted instead of aborting the whole block
+            return False, e
+        finally:
+            self.local.in_worker = False
+
+    def call(self, name: str, args: List[Any], view: StateView, depth: int) -> Any:
+        builtin = BUILTINS.get(name)
+        if builtin is not None:
+            return builtin(view, *args)
+        code = self.functions.get(name)
+        if code is None:
+            raise SVMError(f"Function '{name}' not found")
+        if len(args) != len(code.params):
+            raise SVMError(f"Function '{name}' expects {len(code.params)} arguments but got {len(args)}")
+        if depth >= self.max_depth:
+            raise SVMError(f"Maximum call depth {self.max_depth} exceeded in '{name}'")
+        return self.run(code, dict(zip(code.params, args)), view, depth + 1)
+
+    def run(self, code: CodeObject, env: Dict[str, Any], view: StateView, depth: int) -> Any:
+        stack: List[Any] = []
+        instructions = code.instructions
+        pc = 0
+        while pc < len(instructions):
+            op, arg = instructions[pc]
+            pc += 1
+            if op is OpCode.LOAD_CONST:
+                stack.append(arg)
+            elif op is OpCode.LOAD_NAME:
+                if arg not in env:
+                    raise SVMError(f"Symbol '{arg}' not found")
+                stack.append(env[arg])
+            elif op is OpCode.STORE_NAME:
+                env[arg] = stack.pop()
+            elif op is OpCode.POP:
+                stack.pop()
+            elif op is OpCode.CALL:
+                name, argc = arg
+                args = stack[len(stack) - argc:]
+                del stack[len(stack) - argc:]
+                stack.append(self.call(name, args, view, depth))
+            elif op is OpCode.BINARY_OP:
+                right = stack.pop()
+                stack[-1] = arg(stack[-1], right)
+            elif op is OpCode.UNARY_OP:
+                stack[-1] = arg(stack[-1])
+            elif op is OpCode.JUMP_IF_FALSE_OR_POP:
+                if stack[-1]:
+                    stack.pop()
+                else:
+                    pc += arg
+            elif op is OpCode.JUMP_IF_TRUE_OR_POP:
+                if stack[-1]:
+                    pc += arg
+                else:
+                    stack.pop()
+            elif op is OpCode.PARALLEL:
+                self.run_parallel(arg, env, view, depth)
+        return None
+
+    def run_parallel(self, branches: List[CodeObject], env: Dict[str, Any], view: StateView, depth: int):
+        if getattr(self.local, "in_worker", False):
+            # Already on a worker: waiting on the pool from here could deadlock it,
+            # so nested parallel sections run serially on this worker
+            for branch in branches:
+                self.run(branch, dict(env), view, depth)
+            return
+        def run_branch(branch):
+            return lambda branch_view: self.run(branch, dict(env), branch_view, depth)
+        for ok, value in self.schedule([run_branch(branch) for branch in branches], view):
+            if not ok:
+                raise value
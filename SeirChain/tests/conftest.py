@@ -0,0 +1,21 @@
+"""
+Makes the flat compiler modules importable under pytest.
+
+The compiler's ast.py shadows the standard library module of the same name,
+which pytest imported long before tests are collected. bootstrap.load_compiler
+swaps the compiler's ast.py in only while the compiler modules import.
+
+Run the tests from the repository root:
+
+    python -m pytest SeirChain/tests
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bootstrap import load_compiler
+
+COMPILER_MODULES = ("lexer", "arena", "parser", "visitor", "svm", "pycodegen")
+
+load_compiler(COMPILER_MODULES)
@@ -0,0 +1,55 @@
+"""
+CLI smoke test: compiles a small contract with --profile in a subprocess and
+checks the per-phase timing lines.
+
+Needs the ledger packages (rocksdb, the stdlib Triad Matrix and PoF
+consensus); skipped when they are unavailable. Run from the repository root:
+
+    python -m pytest SeirChain/tests
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+import pytest
+
+try:
+    import SeirChain.stdlib.triad_store
+    import SeirChain.stdlib.pof_consensus
+except ImportError as e:
+    pytest.skip(f"ledger packages unavailable: {e}", allow_module_level=True)
+
+COMPILER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLI = os.path.join(COMPILER_DIR, "cli.py")
+
+SOURCE = """
+function main() {
+    immutable supply = 1000;
+    immutable fee = supply / 100 + 1;
+    parallel {
+        main();
+        supply - fee * 2;
+    }
+}
+"""
+
+class ProfileTest(unittest.TestCase):
+    def run_cli(self, cwd: str, *args: str) -> str:
+        # The parent's sys.path (pytest rootdir, PYTHONPATH) is what makes SeirChain importable
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p and p != COMPILER_DIR))
+        result = subprocess.run([sys.executable, CLI, *args], cwd=cwd, env=env,
+                                capture_output=True, text=True, timeout=60)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return result.stdout
+
+    def test_profile_prints_every_phase(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "pay.cry")
+            with open(source, "w") as f:
+                f.write(SOURCE)
+            output = self.run_cli(tmp, source, "--profile")
+        self.assertIn("Compiler phase timings:", output)
+        for name in ("lex", "parse", "passes", "total"):
+            self.assertRegex(output, rf"(?m)^  {name}\s+\d+\.\d{{3}} ms$")
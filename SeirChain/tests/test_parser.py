@@ -0,0 +1,153 @@
+"""
+Parser tests: operator precedence and associativity, unary operators, calls,
+source spans and syntax error positions.
+
+Run from the repository root:
+
+    python -m pytest SeirChain/tests
+"""
+
+import unittest
+from lexer import Lexer
+from parser import Parser, BinaryExpression, CallExpression, Identifier, Literal, UnaryExpression
+
+PREFIX = "function f() { "
+
+def parse_expression(source: str):
+    program = Parser(Lexer(f"{PREFIX}{source}; }}").tokenize()).parse()
+    return program.declarations[0].body.statements[0]
+
+def sexpr(node) -> str:
+    if isinstance(node, BinaryExpression):
+        return f"({node.operator} {sexpr(node.left)} {sexpr(node.right)})"
+    if isinstance(node, UnaryExpression):
+        return f"({node.operator} {sexpr(node.operand)})"
+    if isinstance(node, CallExpression):
+        return f"({' '.join([node.callee.name] + [sexpr(arg) for arg in node.arguments])})"
+    if isinstance(node, Identifier):
+        return node.name
+    if isinstance(node, Literal):
+        return repr(node.value)
+    raise TypeError(type(node).__name__)
+
+def span(source: str, node):
+    start, end = node.span
+    return source[start - len(PREFIX):end - len(PREFIX)]
+
+class PrecedenceTest(unittest.TestCase):
+    def assertParses(self, source: str, expected: str):
+        self.assertEqual(sexpr(parse_expression(source)), expected)
+
+    def test_multiplicative_binds_tighter_than_additive(self):
+        self.assertParses("1 + 2 * 3", "(+ 1 (* 2 3))")
+        self.assertParses("1 * 2 + 3 % 4", "(+ (* 1 2) (% 3 4))")
+
+    def test_comparison_and_logical_levels(self):
+        self.assertParses("a + 1 < b && c == d || e", "(|| (&& (< (+ a 1) b) (== c d)) e)")
+        self.assertParses("a || b && c", "(|| a (&& b c))")
+
+    def test_left_associative(self):
+        self.assertParses("a - b - c", "(- (- a b) c)")
+        self.assertParses("a / b * c", "(* (/ a b) c)")
+        self.assertParses("a && b && c", "(&& (&& a b) c)")
+
+    def test_parentheses_override_precedence(self):
+        self.assertParses("(1 + 2) * 3", "(* (+ 1 2) 3)")
+        self.assertParses("a - (b - c)", "(- a (- b c))")
+        self.assertParses("((a))", "a")
+
+    def test_unary_operators(self):
+        self.assertParses("-a", "(- a)")
+        self.assertParses("-a * b", "(* (- a) b)")
+        self.assertParses("a - -b", "(- a (- b))")
+        self.assertParses("!a && b", "(&& (! a) b)")
+        self.assertParses("--a", "(- (- a))")
+
+    def test_calls(self):
+        self.assertParses("g()", "(g)")
+        self.assertParses("g(1, a + 2, h(b))", "(g 1 (+ a 2) (h b))")
+        self.assertParses("-g(a) * 2", "(* (- (g a)) 2)")
+        self.assertParses("g((a), (1 + 2) * 3)", "(g a (* (+ 1 2) 3))")
+
+    def test_literals(self):
+        self.assertParses('g(42, "a\\nb", true, false)', "(g 42 'a\\nb' True False)")
+
+    def test_deep_nesting_does_not_recurse(self):
+        depth = 5000
+        node = parse_expression("(" * depth + "1" + " + 1)" * depth)
+        for _ in range(depth):
+            node = node.left
+        self.assertIsInstance(node, Literal)
+
+class BlockTest(unittest.TestCase):
+    def test_deeply_nested_parallel_blocks_do_not_recurse(self):
+        depth = 5000
+        source = "function f() { " + "parallel { g(); " * depth + "}" * depth + " h(); }"
+        statements = Parser(Lexer(source).tokenize()).parse().declarations[0].body.statements
+        self.assertEqual(len(statements), 2)
+        nesting = 0
+        while len(statements) > 1 or nesting == 0:
+            statements = statements[0 if nesting == 0 else 1].body.statements
+            nesting += 1
+        self.assertEqual(nesting, depth)
+
+    def test_unclosed_parallel_block(self):
+        source = "function f() { parallel { g(); }"
+        with self.assertRaises(SyntaxError) as raised:
+            Parser(Lexer(source).tokenize()).parse()
+        self.assertEqual(str(raised.exception), f"Unexpected token TokenType.EOF at position {len(source)}")
+
+class SpanTest(unittest.TestCase):
+    def test_spans_cover_source_text(self):
+        source = "g(a, -b * 2) + c"
+        node = parse_expression(source)
+        self.assertEqual(span(source, node), source)
+        call = node.left
+        self.assertEqual(span(source, call), "g(a, -b * 2)")
+        self.assertEqual(span(source, call.callee), "g")
+        self.assertEqual(span(source, call.arguments[1]), "-b * 2")
+        self.assertEqual(span(source, call.arguments[1].left), "-b")
+        self.assertEqual(span(source, node.right), "c")
+
+    def test_parenthesized_spans_include_parentheses(self):
+        source = "(1 + 2) * 3"
+        node = parse_expression(source)
+        self.assertEqual(span(source, node), source)
+        self.assertEqual(span(source, node.left), "(1 + 2)")
+        self.assertEqual(span(source, node.left.left), "1")
+
+        source = "-(a + b)"
+        node = parse_expression(source)
+        self.assertEqual(span(source, node), source)
+        self.assertEqual(span(source, node.operand), "(a + b)")
+
+        source = "g(((a)), (b - c) % 2)"
+        node = parse_expression(source)
+        self.assertEqual(span(source, node), source)
+        self.assertEqual(span(source, node.arguments[0]), "((a))")
+        self.assertEqual(span(source, node.arguments[1]), "(b - c) % 2")
+
+    def test_views_are_shared(self):
+        node = parse_expression("g(a + b)")
+        self.assertIs(node.arguments, node.arguments)
+        self.assertIs(node.arguments[0].left, node.arguments[0].left)
+
+class SyntaxErrorTest(unittest.TestCase):
+    def assertSyntaxError(self, source: str, message: str):
+        with self.assertRaises(SyntaxError) as raised:
+            parse_expression(source)
+        self.assertEqual(str(raised.exception), message)
+
+    def test_missing_operand(self):
+        self.assertSyntaxError("g(1 +)", f"Unexpected token TokenType.RPAREN at position {len(PREFIX) + 5}")
+        self.assertSyntaxError("1 + * 2", f"Unexpected token TokenType.STAR at position {len(PREFIX) + 4}")
+
+    def test_unclosed_parenthesis(self):
+        self.assertSyntaxError("(1 + 2", f"Expected token TokenType.RPAREN but got TokenType.SEMICOLON "
+                                         f"at position {len(PREFIX) + 6}")
+
+    def test_comma_outside_call(self):
+        self.assertSyntaxError("(a, b)", f"Unexpected token TokenType.COMMA at position {len(PREFIX) + 2}")
+
+    def test_missing_argument(self):
+        self.assertSyntaxError("g(1,)", f"Unexpected token TokenType.RPAREN at position {len(PREFIX) + 4}")
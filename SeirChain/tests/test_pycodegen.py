@@ -0,0 +1,101 @@
+"""
+Python back end tests: bytecode caching, name mangling, the withheld Python
+builtins and agreement with the SVM.
+
+Run from the repository root:
+
+    python -m pytest SeirChain/tests
+"""
+
+import functools
+import os
+import tempfile
+import unittest
+from unittest import mock
+import pycodegen
+from lexer import Lexer
+from parser import Parser
+from pycodegen import BytecodeCache, CompileError, compile_source, load_contract, mangle
+from svm import BUILTINS, SVM, GlobalState, StateView
+
+CONTRACT = """
+function pay(sender: int, receiver: int, amount: int) {
+    immutable ok = transfer(sender, receiver, amount);
+    immutable balance = balance(sender);
+    store(sender, balance * 2 + amount % 7 - (balance / 3));
+    store(receiver, -amount + (ok && amount > 10 || !ok));
+    parallel {
+        store(100 + receiver, balance(receiver));
+        store(200 + sender, load(sender) != 0);
+    }
+}
+"""
+
+def host_env(view: StateView):
+    return {name: functools.partial(builtin, view) for name, builtin in BUILTINS.items()}
+
+def initial_state():
+    return {f"balance:{account}": 1000 for account in range(3)}
+
+class CacheTest(unittest.TestCase):
+    def test_repeated_compiles_hit_the_cache(self):
+        cache = BytecodeCache()
+        code = compile_source(CONTRACT, cache)
+        with mock.patch.object(pycodegen, "compile", side_effect=AssertionError("recompiled"), create=True):
+            self.assertIs(compile_source(CONTRACT, cache), code)
+
+    def test_disk_cache_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            code = compile_source(CONTRACT, BytecodeCache(tmp))
+            key = BytecodeCache.key(CONTRACT)
+            self.assertTrue(os.path.exists(os.path.join(tmp, f"{key}.crypyc")))
+            # A fresh cache on the same directory starts empty in memory and loads from disk
+            reloaded = BytecodeCache(tmp)
+            self.assertNotIn(key, reloaded.entries)
+            self.assertEqual(reloaded.get(key), code)
+
+    def test_key_covers_backend_version(self):
+        key = BytecodeCache.key(CONTRACT)
+        with mock.patch.object(pycodegen, "BACKEND_VERSION", pycodegen.BACKEND_VERSION + 1):
+            self.assertNotEqual(BytecodeCache.key(CONTRACT), key)
+
+class NamespaceTest(unittest.TestCase):
+    def test_python_keywords_are_mangled(self):
+        namespace = load_contract("function lambda(None: int) { store(None, None + 1); }", {"store": lambda key, value: None})
+        self.assertNotIn("lambda", namespace)
+        self.assertIn(mangle("lambda"), namespace)
+        self.assertEqual(mangle("_cry_lambda"), "_cry__cry_lambda")
+
+    def test_python_builtins_are_withheld(self):
+        for callee in ("exec", "open", "print"):
+            namespace = load_contract(f"function f() {{ {callee}(1); }}")
+            with self.assertRaises(NameError):
+                namespace["f"]()
+
+    def test_locals_do_not_shadow_functions(self):
+        view = StateView(GlobalState({"balance:1": 5}))
+        namespace = load_contract("function pay(a: int) { immutable balance = balance(a); store(1, balance); }",
+                                  host_env(view))
+        namespace["pay"](1)
+        self.assertEqual(view.writes, {"1": 5})
+
+    def test_deep_nesting_is_a_compile_error(self):
+        source = "function f(a: int) { immutable x = a" + " + a" * 20000 + "; }"
+        with self.assertRaises(CompileError):
+            compile_source(source)
+
+class SVMAgreementTest(unittest.TestCase):
+    def test_matches_svm(self):
+        calls = [(0, 1, 30), (1, 2, 5), (2, 0, 5000), (0, 2, 7)]
+        vm = SVM(Parser(Lexer(CONTRACT).tokenize()).parse(), initial_state())
+        self.addCleanup(vm.close)
+        for args in calls:
+            vm.invoke("pay", args)
+
+        # Like SVM.invoke: one view per call, committed once the call returns
+        state = GlobalState(initial_state())
+        for args in calls:
+            view = StateView(state)
+            load_contract(CONTRACT, host_env(view))["pay"](*args)
+            state.commit(view.writes)
+        self.assertEqual(state.data, vm.state.data)
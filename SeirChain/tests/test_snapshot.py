@@ -0,0 +1,87 @@
+"""
+Snapshot tests: export -> import round trip and coordinate range lookup.
+
+Needs the ledger packages (rocksdb and the stdlib Triad Matrix); skipped
+when they are unavailable. Run from the repository root:
+
+    python -m pytest SeirChain/tests
+"""
+
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+import pytest
+
+try:
+    from SeirChain.benchmarks.generators import build_triads, generate_triad_matrix
+    from SeirChain.stdlib.snapshot import SnapshotReader, coordinate_key, export_snapshot, import_snapshot
+    from SeirChain.stdlib.triad_store import TriadStore
+except ImportError as e:
+    pytest.skip(f"ledger packages unavailable: {e}", allow_module_level=True)
+
+DEPTH = 3
+
+class SnapshotTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="triad_snapshot_test_")
+        self.triads = build_triads(generate_triad_matrix(depth=DEPTH, transactions_per_triad=2, seed=1))
+        self.source = TriadStore(db_path=os.path.join(self.tmp, "source"))
+        asyncio.run(self.source.put_triads(self.triads))
+        self.path = os.path.join(self.tmp, "matrix.snap")
+        # A small chunk size forces several sorted runs through the merge
+        self.count = export_snapshot(self.path, self.source, chunk_size=7)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def import_into(self, name: str, **kwargs) -> TriadStore:
+        store = TriadStore(db_path=os.path.join(self.tmp, name))
+        asyncio.run(import_snapshot(self.path, store, batch_size=5, **kwargs))
+        return store
+
+    def test_records_sorted_by_coordinate(self):
+        self.assertEqual(self.count, len(self.triads))
+        with SnapshotReader(self.path) as reader:
+            self.assertEqual(len(reader), len(self.triads))
+            self.assertEqual(reader.width, DEPTH)
+            keys = [reader[i] for i in range(len(reader))]
+            self.assertEqual(keys, sorted(keys))
+            ids = {bytes(reader.triad_id(i)) for i in range(len(reader))}
+        self.assertEqual(ids, {triad.id for triad in self.triads})
+
+    def test_round_trip(self):
+        target = self.import_into("target")
+        self.assertEqual(dict(target.iter_items()), dict(self.source.iter_items()))
+        self.assertEqual(target.index_manager.coord_index, self.source.index_manager.coord_index)
+
+    def test_coordinate_range(self):
+        coordinates = sorted(tuple(triad.coordinate) for triad in self.triads)
+        bounds = [(), (0,), (1,), (1, 2), (2, 2, 2), (0, 1, 2, 0), (1, 0, 0, 0)]
+        with SnapshotReader(self.path) as reader:
+            for from_path in bounds:
+                for to_path in bounds:
+                    start, end = reader.coordinate_range(from_path, to_path)
+                    found = [tuple(b - 1 for b in reader[i].rstrip(b"\0")) for i in range(start, end)]
+                    # From from_path up to and including the subtree under to_path
+                    expected = [c for c in coordinates if c >= from_path and c[:len(to_path)] <= to_path]
+                    self.assertEqual(found, expected, (from_path, to_path))
+            self.assertEqual(reader.coordinate_range(), (0, len(reader)))
+
+    def test_import_coordinate_range(self):
+        target = self.import_into("subtree", from_path=(1,), to_path=(1,))
+        expected = {triad.id for triad in self.triads if tuple(triad.coordinate[:1]) == (1,)}
+        self.assertEqual({triad_id for triad_id, _ in target.iter_items()}, expected)
+
+    def test_deep_coordinates(self):
+        key = coordinate_key([2] * 300)
+        self.assertEqual(len(key), 300)
+        deep = build_triads(generate_triad_matrix(depth=0, seed=2))[0]
+        deep.coordinate = (1,) * 300
+        asyncio.run(self.source.put_triad(deep))
+        export_snapshot(self.path, self.source, chunk_size=7)
+        with SnapshotReader(self.path) as reader:
+            self.assertEqual(reader.width, 300)
+        target = self.import_into("deep")
+        self.assertEqual(dict(target.iter_items()), dict(self.source.iter_items()))
@@ -0,0 +1,108 @@
+"""
+SVM scheduler tests: block execution with workers must match serial
+execution, failed transactions roll back, and call depth is bounded.
+
+Run from the repository root:
+
+    python -m pytest SeirChain/tests
+"""
+
+import random
+import unittest
+from lexer import Lexer
+from parser import Parser
+from svm import SVM, SVMError
+
+CONTRACT = """
+function pay(sender: int, receiver: int, amount: int) {
+    transfer(sender, receiver, amount);
+    store(sender, balance(sender) + balance(receiver));
+}
+
+function split(sender: int, a: int, b: int, amount: int) {
+    parallel {
+        transfer(sender, a, amount);
+        transfer(sender, b, amount);
+        parallel {
+            store(a, balance(a) * 2);
+        }
+    }
+}
+
+function bad(account: int) {
+    mint(account, 500);
+    store(account, 1);
+    missing(account);
+}
+
+function down(n: int) {
+    down(n - 1);
+}
+"""
+
+ACCOUNTS = 3
+
+def initial_state():
+    return {f"balance:{account}": 100 for account in range(ACCOUNTS)}
+
+def transactions(count: int, seed: int = 7):
+    # Few accounts, so nearly every transaction conflicts with its neighbours
+    rng = random.Random(seed)
+    txs = []
+    for _ in range(count):
+        sender, a, b = rng.sample(range(ACCOUNTS), 3)
+        amount = rng.randint(1, 60)
+        kind = rng.choice(("pay", "split", "bad"))
+        if kind == "pay":
+            txs.append(("pay", [sender, a, amount]))
+        elif kind == "split":
+            txs.append(("split", [sender, a, b, amount]))
+        else:
+            txs.append(("bad", [sender]))
+    return txs
+
+class SchedulerTest(unittest.TestCase):
+    def execute(self, txs, **kwargs):
+        vm = SVM(Parser(Lexer(CONTRACT).tokenize()).parse(), initial_state(), **kwargs)
+        self.addCleanup(vm.close)
+        results = vm.execute_block(txs)
+        return vm, [(result.success, result.value, result.error) for result in results]
+
+    def assertMatchesSerial(self, txs, **kwargs):
+        serial, serial_results = self.execute(txs)
+        vm, results = self.execute(txs, **kwargs)
+        self.assertEqual(results, serial_results)
+        self.assertEqual(vm.state.data, serial.state.data)
+        return vm
+
+    def test_default_is_sequential(self):
+        vm, _ = self.execute(transactions(10))
+        self.assertIsNone(vm.pool)
+
+    def test_parallel_matches_serial_under_conflicts(self):
+        vm = self.assertMatchesSerial(transactions(200), workers=4, window=8)
+        self.assertGreater(vm.stats.aborts, 0)
+
+    def test_window_of_one(self):
+        self.assertMatchesSerial(transactions(50), workers=4, window=1)
+
+    def test_nested_parallel_in_block_transaction(self):
+        self.assertMatchesSerial([("split", [0, 1, 2, 10])] * 20, workers=4)
+
+    def test_failed_transaction_rolls_back(self):
+        for workers in (1, 4):
+            vm, results = self.execute([("pay", [0, 1, 10]), ("bad", [2]), ("pay", [1, 2, 5])], workers=workers)
+            self.assertEqual([success for success, _, _ in results], [True, False, True])
+            self.assertIn("missing", results[1][2])
+            # Neither the mint nor the store of the failed transaction is visible
+            self.assertEqual(vm.state.data["balance:2"], 105)
+            self.assertNotIn("2", vm.state.data)
+
+    def test_max_depth(self):
+        vm = SVM(Parser(Lexer(CONTRACT).tokenize()).parse(), initial_state(), max_depth=8)
+        self.addCleanup(vm.close)
+        with self.assertRaisesRegex(SVMError, "Maximum call depth 8"):
+            vm.invoke("down", [1])
+        results = vm.execute_block([("down", [1])])
+        self.assertFalse(results[0].success)
+        self.assertIn("Maximum call depth", results[0].error)
@@ -0,0 +1,99 @@
+"""
+Table-driven, iterative AST traversal shared by the compiler passes.
+
+A pass subclasses NodeVisitor and defines `enter_<NodeClass>(node)` and/or
+`leave_<NodeClass>(node, values)` hooks, where `values` holds the results the
+same pass returned for the node's children. Hooks are resolved into a
+per-class dispatch table once per node type instead of building method names
+on every visit, and `walk` uses an explicit stack, so deeply nested programs
+never hit Python's recursion limit. Several passes can share one walk.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from ast import *
+
+def _no_children(node: Node) -> List[Node]:
+    return []
+
+CHILDREN: Dict[type, Callable[[Node], List[Node]]] = {
+    Program: lambda node: node.declarations,
+    FunctionDeclaration: lambda node: [node.body],
+    Block: lambda node: node.statements,
+    ParallelBlock: lambda node: [node.body],
+    VariableDeclaration: lambda node: [node.initializer] if node.initializer else [],
+    CallExpression: lambda node: node.arguments,
+    BinaryExpression: lambda node: [node.left, node.right],
+    UnaryExpression: lambda node: [node.operand],
+    MatchExpression: lambda node: [node.expression] + node.cases,
+    MatchCase: lambda node: [node.pattern, node.body],
+}
+
+_children_cache: Dict[type, Callable[[Node], List[Node]]] = {}
+
+def children_of(node: Node) -> List[Node]:
+    node_type = type(node)
+    children = _children_cache.get(node_type)
+    if children is None:
+        # Subclasses such as the parser's arena views share their base class entry
+        children = next((CHILDREN[base] for base in node_type.__mro__ if base in CHILDREN), _no_children)
+        _children_cache[node_type] = children
+    return children(node)
+
+Handlers = Tuple[Optional[Callable], Optional[Callable]]
+
+class NodeVisitor:
+    # Node type -> (enter, leave), filled in lazily per subclass
+    _dispatch: Dict[type, Handlers] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._dispatch = {}
+
+    @classmethod
+    def handlers(cls, node_type: type) -> Handlers:
+        handlers = cls._dispatch.get(node_type)
+        if handlers is None:
+            enter = leave = None
+            for base in node_type.__mro__:
+                enter = getattr(cls, f"enter_{base.__name__}", None)
+                leave = getattr(cls, f"leave_{base.__name__}", None)
+                if enter is not None or leave is not None:
+                    break
+            else:
+                enter = cls.generic_visit
+            handlers = cls._dispatch[node_type] = (enter, leave)
+        return handlers
+
+    def generic_visit(self, node: Node):
+        raise NotImplementedError(f"No enter_{type(node).__name__} or leave_{type(node).__name__} method")
+
+    def visit(self, node: Node) -> Any:
+        return walk(node, self)[0]
+
+def walk(root: Node, *visitors: NodeVisitor) -> List[Any]:
+    """Traverse `root` once, running every visitor's hooks in order at each node.
+
+    Returns the value each visitor produced for the root node.
+    """
+    values: List[List[Any]] = [[] for _ in visitors]
+    # (node, child count or None when the node has not been entered yet)
+    stack: List[Tuple[Node, Optional[int]]] = [(root, None)]
+    while stack:
+        node, child_count = stack.pop()
+        node_type = type(node)
+        if child_count is None:
+            for visitor in visitors:
+                enter = visitor.handlers(node_type)[0]
+                if enter is not None:
+                    enter(visitor, node)
+            children = children_of(node)
+            stack.append((node, len(children)))
+            stack.extend((child, None) for child in reversed(children))
+        else:
+            for visitor, results in zip(visitors, values):
+                leave = visitor.handlers(node_type)[1]
+                child_values = results[len(results) - child_count:] if child_count else []
+                if child_count:
+                    del results[len(results) - child_count:]
+                results.append(leave(visitor, node, child_values) if leave is not None else None)
+    return [results[0] for results in values]